@@ -1,18 +1,23 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import io
-import folium
-from streamlit_folium import folium_static
-from PIL import Image
-import matplotlib.pyplot as plt
-import seaborn as sns
-import services.weather_alerts as weather
-import services.waste_classification as waste_classifier
-import services.datasf_analytics_services as analytics
-from services.recycling_centers import get_disposal_facilities
-from services.location_services import get_coordinates, get_coordinates_311
-import services.sf_data_services as sf_data
-import services.datasf_analytics_services as data_sf
-from services.sf_center import create_sf_map, get_waste_disposal_locations
+from services.lazy_import import lazy_import
+
+# ✅ Heavy libraries and services load on first use, not at startup
+folium = lazy_import("folium")
+weather = lazy_import("services.weather_alerts")
+waste_classifier = lazy_import("services.waste_classification")
+analytics = lazy_import("services.datasf_analytics_services")
+recycling_centers = lazy_import("services.recycling_centers")
+location_services = lazy_import("services.location_services")
+sf_data = lazy_import("services.sf_data_services")
+data_sf = analytics
+sf_center = lazy_import("services.sf_center")
+map_rendering = lazy_import("services.map_rendering")
+map_cache = lazy_import("services.map_cache")
+prefetch = lazy_import("services.prefetch")
+settings = lazy_import("config.settings")
+refresh = lazy_import("services.refresh_scheduler")
 
 
 # ----------- Streamlit UI Configuration ------------
@@ -22,6 +27,30 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# ----------- Map Cache ------------
+@st.cache_resource
+def start_static_map_prebuild():
+    """Renders static maps in the background once per process, off the first request's path."""
+    import threading
+
+    thread = threading.Thread(target=map_cache.prebuild_static_maps, daemon=True)
+    thread.start()
+    return thread
+
+start_static_map_prebuild()
+
+def show_map(html, width=700, height=500):
+    """Embeds cached map HTML the same way `folium_static` embeds a map it has just rendered."""
+    components.html(html, width=width, height=height + 10)
+
+# ----------- Upstream Prefetch ------------
+@st.cache_resource(ttl=settings.PREFETCH_TTL)
+def start_prefetch():
+    """Fires every independent dataset fetch at once; shared by all sessions until the TTL."""
+    return prefetch.start_prefetch(settings.DEFAULT_SF_LOCATION)
+
+prefetched = start_prefetch()
+
 # ----------- Custom Styling ------------
 def load_css():
     with open("assets/styles.css") as f:
@@ -42,14 +71,13 @@ st.markdown("<h1 class='section-header'>♻️ Smart Waste Management System</h1
 if "classification_result" not in st.session_state:
     st.session_state["classification_result"] = None
 
-# ----------- Tabs ------------
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["🗑 Waste Classification", "📍 SF Disposal Centers", "📊 Waste Analytics","🌉 SF Public Facility Data","US Disposal Facilities", "Weather Conditions"])
-
-# ✅ Fetch Cleaned Data
-df = analytics.get_cleaned_data()
+# ----------- Sections ------------
+# Each section is a fragment: widget interactions inside it rerun only that section,
+# and only the selected section runs at all (unlike st.tabs, which executes every tab).
 
 # ----------- 1️⃣ Waste Classification ------------
-with tab1:
+@st.fragment
+def render_waste_classification():
     
     st.markdown("""
     <div class='section-header' style='text-align: center; font-size: 28px; font-weight: bold; color: #145a32;'>
@@ -76,32 +104,31 @@ with tab1:
         if st.button("Classify Waste"):
             if waste_item:
                 with st.spinner("Analyzing..."):
-                    result = waste_classifier.classify_waste(waste_item)
+                    result = waste_classifier.classify_waste_stream(waste_item)
+
+                if "error" in result:
+                    st.error(f"⚠️ {result['error']}")
+                else:
                     category = result["category"]
                     bin_suggestion = result["bin"]
                     bin_image = BIN_IMAGES.get(category)
-                    explanation = result["explanation"]
 
-
-                st.info(f"**Category:** {category}")
-                st.markdown("""
-                <div class='explanation-container'>
-                    <h3>📘 Explanation</h3>
-                    <p>{}</p>
-                </div>
-                """.format(explanation), unsafe_allow_html=True)
-                
-                st.markdown("""
-                <div class='bin-suggestion-container'>
-                    <h3>🗑 Suggested Disposal Bin</h3>
-                    <p><strong>{}</strong></p>
-                </div>
-                """.format(bin_suggestion), unsafe_allow_html=True)
-                
-                if bin_suggestion != "Unknown" and bin_image:
-                    st.image(bin_image, caption=f"{bin_suggestion} Bin", width=150, output_format="SVG")
-                else:
-                    st.warning("⚠️ Unable to determine the correct bin. Please verify with local waste management guidelines.")
+                    # ✅ Category is shown as soon as it is decided; the explanation streams in below
+                    st.info(f"**Category:** {category}")
+                    st.markdown("### 📘 Explanation")
+                    st.write_stream(result["explanation_stream"])
+                    
+                    st.markdown("""
+                    <div class='bin-suggestion-container'>
+                        <h3>🗑 Suggested Disposal Bin</h3>
+                        <p><strong>{}</strong></p>
+                    </div>
+                    """.format(bin_suggestion), unsafe_allow_html=True)
+                    
+                    if bin_suggestion != "Unknown" and bin_image:
+                        st.image(bin_image, caption=f"{bin_suggestion} Bin", width=150, output_format="SVG")
+                    else:
+                        st.warning("⚠️ Unable to determine the correct bin. Please verify with local waste management guidelines.")
 
 
     elif input_method == "Upload an Image":
@@ -109,12 +136,14 @@ with tab1:
 
         if uploaded_file:
             image_bytes = io.BytesIO(uploaded_file.getvalue())
+            from PIL import Image
+
             image = Image.open(image_bytes)
             st.image(image, caption="Uploaded Image", width=300)
 
             if st.button("Analyze Waste"):
                 with st.spinner("🔍 Analyzing Image..."):
-                    result = waste_classifier.analyze_image(image_bytes)
+                    result = waste_classifier.analyze_image_stream(image_bytes)
 
                 if "error" in result:
                     st.error(f"⚠️ {result['error']}")
@@ -122,12 +151,11 @@ with tab1:
                     category = result["category"]
                     bin_suggestion = result["bin"]
                     bin_image = BIN_IMAGES.get(category)
-                    explanation = result["explanation"]
 
                     # Display Results
                     st.success(f"**Category:** {category}")
                     st.write("### 📘 Explanation:")
-                    st.write(explanation)
+                    st.write_stream(result["explanation_stream"])
                     
                     st.write("### 🗑 Suggested Disposal Bin:")
                     if bin_suggestion != "Unknown":
@@ -150,7 +178,8 @@ facility_types = {
     "Composting Facility": "5"
 }
 
-with tab5:
+@st.fragment
+def render_us_disposal_facilities():
     st.markdown("""
     <div class='section-header' style='text-align: center; font-size: 28px; font-weight: bold; color: #145a32;'>
         📍 Find Disposal Centers
@@ -165,13 +194,13 @@ with tab5:
 
     if st.button("Find Facilities"):
         if location:
-            lat, lng, city, state_code = get_coordinates(location)
+            lat, lng, city, state_code = location_services.get_coordinates(location)
 
             if state_code is None:
                 st.error("❌ Could not determine state. Please enter a valid city or ZIP code.")
             else:
                 selected_type_id = facility_types[facility_choice]  # Get facility type ID
-                facilities = get_disposal_facilities(state_code, selected_type_id)  # Fetch facilities
+                facilities = recycling_centers.get_disposal_facilities(state_code, selected_type_id)  # Fetch facilities
 
                 if isinstance(facilities, list) and len(facilities) > 0:
                     st.markdown(f"<p class='big-font'>🏭 Available {facility_choice} Facilities:</p>", unsafe_allow_html=True)
@@ -200,21 +229,24 @@ with tab5:
     if facilities and isinstance(facilities, list) and len(facilities) > 0 and lat and lng:
         st.markdown("<h3 class='section-header'>🗺 Facility Locations on Map</h3>", unsafe_allow_html=True)
 
-        # ✅ Add a map visualization (Folium)
-        m = folium.Map(location=[lat, lng], zoom_start=8)
+        # ✅ Add a map visualization (Folium); identical searches reuse the rendered map
+        points = [
+            (facility.get("latitude", lat), facility.get("longitude", lng), facility.get("name", "Unknown"))
+            for facility in facilities
+        ]
 
-        for facility in facilities:
-            fac_lat = facility.get("latitude", lat)
-            fac_lng = facility.get("longitude", lng)
-            facility_name = facility.get("name", "Unknown")
+        def build_facility_map():
+            m = folium.Map(location=[lat, lng], zoom_start=8)
+            map_rendering.add_points(
+                m,
+                [point[0] for point in points],
+                [point[1] for point in points],
+                popups=[f"<b>{point[2]}</b>" for point in points],
+                color="green",
+            )
+            return m
 
-            folium.Marker(
-                location=[fac_lat, fac_lng],
-                popup=f"<b>{facility_name}</b>",
-                icon=folium.Icon(color="green", icon="info-sign")
-            ).add_to(m)
-
-        folium_static(m)
+        show_map(map_cache.get_map_html(("us_facilities", lat, lng, points), build_facility_map))
 
 
 
@@ -222,7 +254,8 @@ with tab5:
    
 
 # ----------- 4️⃣ Weather Conditions ------------
-with tab6:
+@st.fragment
+def render_weather():
     st.markdown("""
     <div class='section-header' style='text-align: center; font-size: 28px; font-weight: bold; color: #145a32;'>
         ☀️ Weather Conditions
@@ -242,14 +275,12 @@ with tab6:
 
 
 
-# ✅ Load SF Pit Stop Data
-pit_stop_df = sf_data.get_cleaned_pit_stop_data()
-
-# ✅ Add a New Tab for SF Data
-
-
 # ----------- 4️⃣ San Francisco Waste & Public Facility  ------------
-with tab4:
+@st.fragment
+def render_sf_public_facilities():
+    # ✅ Load SF Pit Stop Data (prefetched at session start; fetched here only if that failed)
+    prefetch.wait(prefetched, "pit_stops")
+    pit_stop_df = sf_data.get_cleaned_pit_stop_data()
     
     st.markdown("""
     <div class='section-header' style='text-align: center; font-size: 28px; font-weight: bold; color: #145a32;'>
@@ -257,7 +288,7 @@ with tab4:
     </div>
     """, unsafe_allow_html=True)
     # 🔍 User Input for Searching Nearby Pit Stops
-    user_location = st.text_input("Enter a location (ZIP, address, or city) to find nearby public restrooms:", "Union Square, San Francisco, CA")
+    user_location = st.text_input("Enter a location (ZIP, address, or city) to find nearby public restrooms:", settings.DEFAULT_SF_LOCATION)
 
     max_distance_km = st.slider("Select search radius (in km):", min_value=1, max_value=10, value=5)
 
@@ -275,26 +306,35 @@ with tab4:
                 if not nearby_pit_stops.empty:
                     st.markdown(f"### 🚻 Nearby Public Restrooms ({len(nearby_pit_stops)})")
 
-                    # 🗺️ Display Map with Pit Stops
-                    sf_map = folium.Map(location=[user_lat, user_lng], zoom_start=14)
+                    # 🗺️ Display Map with Pit Stops (rendered once per location and result set)
+                    popups = (
+                        nearby_pit_stops["name"].astype(str) + " - " + nearby_pit_stops["address"].astype(str)
+                        + " (" + nearby_pit_stops["hours"].astype(str) + ")"
+                    )
 
-                    # Add User Location Marker
-                    folium.Marker(
-                        [user_lat, user_lng],
-                        popup="Your Location",
-                        icon=folium.Icon(color="blue", icon="info-sign")
-                    ).add_to(sf_map)
+                    def build_pit_stop_map():
+                        sf_map = folium.Map(location=[user_lat, user_lng], zoom_start=14)
 
-                    # Add Nearby Pit Stops
-                    for _, row in nearby_pit_stops.iterrows():
+                        # Add User Location Marker
                         folium.Marker(
-                            [row["latitude"], row["longitude"]],
-                            popup=f"{row['name']} - {row['address']} ({row['hours']})",
-                            tooltip=row["name"],
-                            icon=folium.Icon(color="green", icon="info-sign")
+                            [user_lat, user_lng],
+                            popup="Your Location",
+                            icon=folium.Icon(color="blue", icon="info-sign")
                         ).add_to(sf_map)
 
-                    folium_static(sf_map)
+                        # Add Nearby Pit Stops
+                        map_rendering.add_points(
+                            sf_map,
+                            nearby_pit_stops["latitude"], nearby_pit_stops["longitude"],
+                            popups=popups, tooltips=nearby_pit_stops["name"], color="green",
+                        )
+                        return sf_map
+
+                    map_inputs = (
+                        "pit_stops", user_lat, user_lng,
+                        nearby_pit_stops["latitude"].tolist(), nearby_pit_stops["longitude"].tolist(), popups.tolist(),
+                    )
+                    show_map(map_cache.get_map_html(map_inputs, build_pit_stop_map))
 
                     # 🔥 **Meaningful Data Summary Instead of Raw Table**
                     st.markdown("## 📊 Key Insights About Nearby Public Restrooms")
@@ -322,8 +362,9 @@ with tab4:
 
 
 
-  # ----------- 6️⃣ Waste Analytics Dashboard ------------
-with tab3:
+# ----------- 6️⃣ Waste Analytics Dashboard ------------
+@st.fragment
+def render_waste_analytics():
    
     st.markdown("""
     <div class='section-header' style='text-align: center; font-size: 28px; font-weight: bold; color: #145a32;'>
@@ -331,31 +372,28 @@ with tab3:
     </div>
     """, unsafe_allow_html=True)
     with st.spinner("Fetching and analyzing waste complaint data..."):
-        df_311 = data_sf.get_sf_311_data()
+        # ✅ Aggregated by the SoQL server; only per-neighborhood counts come over the wire
+        prefetch.wait(prefetched, "sf_311_counts")
+        top_complaint_locations = data_sf.get_top_complaint_locations(top_n=10)
 
-    if df_311.empty:
+    if top_complaint_locations.empty:
         st.error("❌ No SF 311 data available for analysis.")
     else:
-        st.success(f"✅ Loaded {len(df_311)} waste complaints from SF 311 data.")
-
-        # 🔍 Identify Top 10 Complaint Locations
-        top_complaint_locations = data_sf.get_top_complaint_locations(df_311, top_n=10)
+        st.success(f"✅ Top neighborhoods account for {top_complaint_locations['total_reports'].sum()} waste complaints in SF 311 data.")
 
-        if not top_complaint_locations.empty:
-            st.markdown("### 🏙 Top 10 Neighborhoods with Most Waste Complaints")
-            st.table(top_complaint_locations)
+        st.markdown("### 🏙 Top 10 Neighborhoods with Most Waste Complaints")
+        st.table(top_complaint_locations[["neighborhoods_sffind_boundaries", "total_reports", "common_complaint"]])
 
-            # 🗺️ Generate Map with Top Complaint Locations
+        # 🗺️ Generate Map with Top Complaint Locations
+        top_map_html = data_sf.get_top_complaint_map_html(top_complaint_locations)
+        if top_map_html is not None:
             st.markdown("### 🗺 Complaint Hotspots in San Francisco")
-            top_map = data_sf.generate_top_complaint_map(df_311, top_complaint_locations)
-            folium_static(top_map)
-
-        else:
-            st.warning("⚠️ No complaint locations found.")
+            show_map(top_map_html)
 
 
 # ----------- 2️⃣ Suggested Waste Disposal Locations ------------
-with tab2:
+@st.fragment
+def render_sf_disposal_centers():
     
     # Streamlit App Title
     
@@ -369,7 +407,7 @@ with tab2:
     
     # Column 1: List of Locations - Compact Layout
     with col1:
-        locations = get_waste_disposal_locations()
+        locations = sf_center.get_waste_disposal_locations()
         
         for loc in locations:
             hours = loc.get('hours', 'N/A')
@@ -390,7 +428,28 @@ with tab2:
     # Column 2: Interactive Map
     with col2:
         st.markdown("<h3>🗺 Facility Locations</h3>", unsafe_allow_html=True)
-        sf_map = create_sf_map()
-        folium_static(sf_map)
+        show_map(sf_center.get_sf_map_html())
     
     st.markdown("</div>", unsafe_allow_html=True)
+
+
+# ----------- Navigation ------------
+SECTIONS = {
+    "🗑 Waste Classification": render_waste_classification,
+    "📍 SF Disposal Centers": render_sf_disposal_centers,
+    "📊 Waste Analytics": render_waste_analytics,
+    "🌉 SF Public Facility Data": render_sf_public_facilities,
+    "US Disposal Facilities": render_us_disposal_facilities,
+    "Weather Conditions": render_weather,
+}
+
+# ✅ Dataset freshness (served stale-while-revalidate by the refresh scheduler)
+with st.sidebar.expander("🔄 Data Freshness"):
+    freshness = refresh.scheduler.status()
+    if freshness:
+        st.dataframe(freshness, hide_index=True)
+    else:
+        st.caption("No datasets loaded yet.")
+
+active_section = st.radio("Section", list(SECTIONS), horizontal=True, key="active_section", label_visibility="collapsed")
+SECTIONS[active_section]()
@@ -0,0 +1,31 @@
+"""pytest-benchmark wrappers around the cases in benchmarks/suite.py.
+
+The file name keeps it out of a plain `pytest` run; pass it explicitly. Results can be
+saved and compared with pytest-benchmark's own options.
+
+Run from the repository root:
+    python -m pytest benchmarks/bench_suite.py -k PitStops
+    python -m pytest benchmarks/bench_suite.py --benchmark-autosave
+    python -m pytest benchmarks/bench_suite.py --benchmark-compare --benchmark-compare-fail=mean:20%
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.suite import BENCHMARKS, no_network
+
+CASES = [
+    pytest.param(cls, name, param, id=f"{cls.__name__}.{name}[{param}]")
+    for cls in BENCHMARKS
+    for name in sorted(dir(cls))
+    if name.startswith("time_")
+    for param in cls.params
+]
+
+
+@pytest.mark.parametrize("cls, name, param", CASES)
+def test_benchmark(benchmark, cls, name, param):
+    with no_network():
+        bench = cls()
+        bench.setup(param)
+        benchmark(getattr(bench, name), param)
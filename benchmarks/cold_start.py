@@ -0,0 +1,63 @@
+"""Cold-start benchmark: module import time and first paint of app.py.
+
+Every measurement runs in a fresh interpreter so nothing is already in sys.modules.
+Run from the repository root:
+    python -m benchmarks.cold_start
+"""
+import json
+import subprocess
+import sys
+
+MODULES = [
+    "config.settings",
+    "services.weather_alerts",
+    "services.waste_classification",
+    "services.datasf_analytics_services",
+    "services.recycling_centers",
+    "services.location_services",
+    "services.sf_data_services",
+    "services.sf_center",
+]
+REPEAT = 3
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+# AppTest runs the script headlessly, the same way a browser session's first run does
+FIRST_PAINT_SNIPPET = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+for name in ("OPENAI_API_KEY", "GOOGLE_MAPS_API_KEY", "OPENWEATHER_API_KEY"):
+    at.secrets[name] = "benchmark"
+ready = time.perf_counter()
+at.run()
+done = time.perf_counter()
+print(json.dumps({"runtime_import": ready - start, "first_paint": done - ready, "exceptions": len(at.exception)}))
+"""
+
+
+def _run(snippet):
+    result = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+def run():
+    print(f"{'module':<40} {'import (best of 3)':>20}")
+    for module in MODULES:
+        timings = [float(_run(IMPORT_SNIPPET.format(module=module))) for _ in range(REPEAT)]
+        print(f"{module:<40} {min(timings) * 1000:>18.1f}ms")
+
+    paints = [json.loads(_run(FIRST_PAINT_SNIPPET)) for _ in range(REPEAT)]
+    best = min(paints, key=lambda p: p["first_paint"])
+    print(f"\nstreamlit testing import: {best['runtime_import'] * 1000:.1f}ms")
+    print(f"app.py first paint:       {best['first_paint'] * 1000:.1f}ms (exceptions: {best['exceptions']})")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,47 @@
+"""Complaint hotspot benchmark: per-neighborhood filtering + mode() lambda vs. one grouped pass.
+
+Run from the repository root:
+    python -m benchmarks.complaint_hotspots
+"""
+from benchmarks.synthetic import make_311_data
+from benchmarks.timing import best_of
+from services.datasf_analytics_services import complaint_counts_from_rows, top_locations_from_counts
+
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+TOP_N = 10
+
+
+def legacy_hotspots(df, top_n=TOP_N):
+    """The previous implementation: groupby with a mode() lambda, then one boolean filter per neighborhood."""
+    top = (
+        df.groupby("neighborhoods_sffind_boundaries")
+        .agg(
+            total_reports=("address", "count"),
+            common_complaint=("service_subtype", lambda x: x.mode().iloc[0] if not x.empty and not x.mode().empty else "Unknown"),
+        )
+        .reset_index()
+        .sort_values(by="total_reports", ascending=False)
+        .head(top_n)
+    )
+    coordinates = [
+        df[df["neighborhoods_sffind_boundaries"] == name][["lat", "long"]].mean()
+        for name in top["neighborhoods_sffind_boundaries"]
+    ]
+    return top, coordinates
+
+
+def single_pass_hotspots(df, top_n=TOP_N):
+    return top_locations_from_counts(complaint_counts_from_rows(df), top_n)
+
+
+def run():
+    print(f"{'rows':>10} {'legacy':>10} {'single pass':>12} {'speedup':>8}")
+    for n_rows in ROW_COUNTS:
+        df = make_311_data(n_rows)
+        legacy = best_of(lambda: legacy_hotspots(df))
+        single = best_of(lambda: single_pass_hotspots(df))
+        print(f"{n_rows:>10,} {legacy:>9.3f}s {single:>11.3f}s {legacy / single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,48 @@
+"""Memory benchmark: street and SF 311 frames before and after the compact schema.
+
+Run from the repository root:
+    python -m benchmarks.frame_memory
+"""
+import pandas as pd
+
+from benchmarks.synthetic import make_311_data, make_street_data
+from services.datasf_analytics_services import preprocess_data
+from services.frame_schema import SF_311_SCHEMA, column_memory, memory_report, optimize_frame
+
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+
+
+def legacy_street(raw):
+    """The previous preprocess_data output: object columns plus float64 counts."""
+    df = raw.copy()
+    for col in ["how_many_instances_of_graffiti", "how_many_instances_of_feces", "how_many_large_abandoned", "how_many_abandoned_syringes"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    df["creationdate"] = pd.to_datetime(df["creationdate"])
+    df["route_type"] = df["is_this_route_predominantly"].map({"1": "Commercial", "2": "Residential", "3": "Industrial"})
+    df["cleanliness_level"] = df["select_the_statement_that"].map(
+        {"1": "Very Clean", "2": "Moderate Litter", "3": "Litter Accumulation", "4": "Severely Dirty"}
+    )
+    return df
+
+
+def run():
+    for n_rows in ROW_COUNTS:
+        raw_street = make_street_data(n_rows)
+        raw_311 = make_311_data(n_rows)
+        street = preprocess_data(raw_street.copy())
+
+        report = memory_report({
+            "street (before)": legacy_street(raw_street),
+            "street (compact)": street,
+            "sf_311 (before)": raw_311,
+            "sf_311 (compact)": optimize_frame(raw_311, SF_311_SCHEMA),
+        })
+        print(f"\n{n_rows:,} rows")
+        print(report.to_string(index=False, float_format=lambda mb: f"{mb:,.1f}"))
+
+    print("\nLargest street columns (compact):")
+    print(column_memory(street).head(10).to_string(float_format=lambda mb: f"{mb:,.2f}"))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,189 @@
+"""Load test: N concurrent headless app sessions against the local upstream stand-in.
+
+Each session runs app.py through AppTest and clicks through every section. The report
+gives p50/p95/p99 latency per interaction and upstream calls per session. Sessions share
+one process, so they share st.cache_resource and the service-level caches, the same way
+browser sessions share one Streamlit server.
+
+The app runs from a scratch directory with links to the code, so the load test never
+touches the real street cache, gazetteer or result cache.
+
+Run from the repository root:
+    python -m benchmarks.load_test --sessions 20 --latency-ms 120 --jitter-ms 40
+    python -m benchmarks.load_test --sessions 50 --concurrency 10 --error-rate 0.05 --json load.json
+"""
+import argparse
+import collections
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.standin_server import add_config_arguments, config_from_args, start_server, upstream_env
+
+WASTE_ITEMS = ["Pizza Box", "Broken Umbrella", "Ceramic Mug", "Bubble Wrap", "Paint Can", "Old Sneakers"]
+CITIES = ["San Francisco", "Oakland", "Portland", "Austin", "Denver"]
+US_LOCATIONS = ["Austin, TX", "Portland, OR", "Denver, CO", "Sacramento, CA"]
+PERCENTILES = (50, 95, 99)
+
+
+def prepare_workdir(root):
+    """Scratch directory that links to the repository's code and assets but not its caches."""
+    workdir = tempfile.mkdtemp(prefix="load_test_")
+    for entry in os.listdir(root):
+        path = os.path.join(root, entry)
+        if entry.startswith(".") or not (os.path.isdir(path) or entry.endswith(".py")):
+            continue
+        os.symlink(path, os.path.join(workdir, entry))
+    return workdir
+
+def configure_environment(base_url, workdir):
+    os.environ.update(upstream_env(base_url))
+    os.environ.update({
+        "GEOCODE_PROVIDERS": "google",  # Nominatim's 1 request/second throttle would dominate the timings
+        "GOOGLE_MAPS_API_KEY": "standin",
+        "OPENWEATHER_API_KEY": "standin",
+        "OPENAI_API_KEY": "standin",
+        "RESULT_CACHE_PATH": os.path.join(workdir, ".cache", "results.sqlite3"),
+        "SNAPSHOT_DIR": os.path.join(workdir, ".cache", "snapshots"),
+        "MAP_CACHE_DIR": os.path.join(workdir, ".cache", "maps"),
+    })
+
+
+# ✅ One Session
+def _section(at, name):
+    """Switches the section radio to the option whose label contains `name`."""
+    radio = at.radio(key="active_section")
+    radio.set_value(next(option for option in radio.options if name in option))
+    return at.run()
+
+def _submit(at, text, button):
+    at.text_input[0].input(text)
+    next(b for b in at.button if b.label == button).click()
+    return at.run()
+
+def run_session(index):
+    """
+    Runs one session's interactions in order.
+
+    Returns:
+        list: (interaction, seconds, exceptions) tuples.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    # AppTest resolves relative paths against this file, not the working directory
+    at = AppTest.from_file(os.path.abspath("app.py"), default_timeout=180)
+    for name in ("OPENAI_API_KEY", "GOOGLE_MAPS_API_KEY", "OPENWEATHER_API_KEY"):
+        at.secrets[name] = "standin"
+
+    steps = [
+        ("first_paint", lambda: at.run()),
+        ("classify_text", lambda: _submit(at, WASTE_ITEMS[index % len(WASTE_ITEMS)], "Classify Waste")),
+        ("sf_disposal_centers", lambda: _section(at, "SF Disposal Centers")),
+        ("waste_analytics", lambda: _section(at, "Waste Analytics")),
+        ("sf_facilities", lambda: _section(at, "SF Public Facility Data")),
+        ("find_restrooms", lambda: next(b for b in at.button if b.label == "Find Nearby Restrooms").click().run()),
+        ("us_facilities", lambda: _section(at, "US Disposal Facilities")),
+        ("find_facilities", lambda: _submit(at, US_LOCATIONS[index % len(US_LOCATIONS)], "Find Facilities")),
+        ("weather", lambda: _section(at, "Weather Conditions")),
+        ("get_weather", lambda: _submit(at, CITIES[index % len(CITIES)], "Get Weather")),
+    ]
+
+    timings = []
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+            failed = len(at.exception)  # Exceptions raised by this run only
+        except Exception:
+            failed = 1  # The script timed out or the widget never rendered
+        timings.append((name, time.perf_counter() - start, failed))
+        if failed and name == "first_paint":
+            break
+    return timings
+
+
+# ✅ Report
+def summarize(results, calls, sessions, wall_seconds):
+    by_step = collections.defaultdict(list)
+    errors = collections.Counter()
+    for timings in results:
+        for name, seconds, failed in timings:
+            by_step[name].append(seconds)
+            errors[name] += failed
+
+    interactions = {
+        name: {
+            "count": len(values),
+            "errors": errors[name],
+            **{f"p{p}_ms": float(np.percentile(values, p)) * 1000 for p in PERCENTILES},
+            "max_ms": max(values) * 1000,
+        }
+        for name, values in by_step.items()
+    }
+    return {
+        "sessions": sessions,
+        "wall_seconds": wall_seconds,
+        "interactions": interactions,
+        "upstream_calls": dict(calls),
+        "upstream_calls_per_session": {name: count / sessions for name, count in calls.items()},
+    }
+
+def print_report(report):
+    print(f"\n{report['sessions']} sessions in {report['wall_seconds']:.1f}s\n")
+    print(f"{'interaction':<22} {'n':>4} {'err':>4} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}")
+    for name, row in report["interactions"].items():
+        print(f"{name:<22} {row['count']:>4} {row['errors']:>4} "
+              + " ".join(f"{row[key]:>8.0f}ms" for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")))
+
+    print(f"\n{'upstream':<22} {'calls':>6} {'per session':>12}")
+    for name, count in sorted(report["upstream_calls"].items()):
+        print(f"{name:<22} {count:>6} {report['upstream_calls_per_session'][name]:>12.2f}")
+    total = sum(report["upstream_calls"].values())
+    print(f"{'total':<22} {total:>6} {total / report['sessions']:>12.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test against the upstream stand-in.")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, help="Sessions in flight at once (default: all)")
+    parser.add_argument("--json", help="Also write the report to this file")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    root = os.getcwd()
+    server, base_url, stats = start_server(config_from_args(args))
+    workdir = prepare_workdir(root)
+    try:
+        configure_environment(base_url, workdir)
+        os.environ["SF_311_SERVER_AGGREGATION"] = "0" if args.no_aggregation else "1"
+        os.chdir(workdir)
+        sys.path.insert(0, workdir)
+        print(f"Stand-in at {base_url}, app running from {workdir}")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency or args.sessions) as pool:
+            results = list(pool.map(run_session, range(args.sessions)))
+        wall_seconds = time.perf_counter() - start
+
+        # Background work (prefetch, scheduler refreshes) may still be finishing; give it a moment
+        time.sleep(1)
+        report = summarize(results, collections.Counter(stats), args.sessions, wall_seconds)
+    finally:
+        # Also runs when a session raises, so no stand-in thread or scratch directory outlives the run
+        server.shutdown()
+        os.chdir(root)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(report)
+    if args.json:
+        with open(os.path.join(root, args.json), "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+"""Local stand-in for every upstream the app calls, with latency and error injection.
+
+Serves Socrata (street maintenance, SF 311, Pit Stops), I-WASTE, Google Geocoding and
+Places, OpenWeather, Nominatim and OpenAI chat completions (streamed and not). Responses
+replay recorded fixtures from `--fixtures` when present and are synthesized otherwise.
+Google Cloud Vision is gRPC and is not stood in; image analysis still needs the real API.
+
+Run from the repository root:
+    python -m benchmarks.standin_server serve --port 8765 --latency-ms 80 --error-rate 0.02
+    python -m benchmarks.standin_server record   # capture fixtures from the live upstreams
+
+`serve` prints the environment variables that point the app at the stand-in.
+Call counts per endpoint are served at GET /__stats and reset with POST /__reset.
+"""
+import argparse
+import collections
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from benchmarks.synthetic import make_311_data, make_pit_stop_data, make_street_data
+
+FIXTURES_DIR = os.path.join("benchmarks", "fixtures")
+
+# Endpoint name -> path on the stand-in
+PATHS = {
+    "street_maintenance": "/resource/street.json",
+    "sf_311": "/resource/sf311.json",
+    "pit_stops": "/resource/pitstops.json",
+    "geocode": "/maps/api/geocode/json",
+    "places": "/maps/api/place/nearbysearch/json",
+    "weather": "/data/2.5/weather",
+    "nominatim": "/search",
+    "openai": "/v1/chat/completions",
+}
+IWASTE_PREFIX = "/iwaste/api"
+
+
+def upstream_env(base_url):
+    """Environment variables (read by config/settings.py) that route every upstream to `base_url`."""
+    host = urlparse(base_url).netloc
+    return {
+        "STREET_MAINTENANCE": base_url + PATHS["street_maintenance"],
+        "SF_311_API_URL": base_url + PATHS["sf_311"],
+        "SF_PIT_STOP_API_URL": base_url + PATHS["pit_stops"],
+        "GOOGLE_GEOCODING_API_URL": base_url + PATHS["geocode"],
+        "GOOGLE_MAPS_API_URL": base_url + PATHS["places"],
+        "OPENWEATHER_API_URL": base_url + PATHS["weather"],
+        "IWASTE_API_URL": base_url + IWASTE_PREFIX,
+        "OPENAI_BASE_URL": base_url + "/v1",
+        "NOMINATIM_DOMAIN": host,
+        "NOMINATIM_SCHEME": "http",
+    }
+
+
+class StandinConfig:
+    """Dataset sizes plus latency and error injection, globally or per endpoint name."""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, error_status=503, endpoint_latency=None,
+                 street_rows=5_000, sf_311_rows=20_000, pit_stop_rows=300, server_aggregation=True,
+                 fixtures_dir=FIXTURES_DIR, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.endpoint_latency = endpoint_latency or {}
+        self.street_rows = street_rows
+        self.sf_311_rows = sf_311_rows
+        self.pit_stop_rows = pit_stop_rows
+        self.server_aggregation = server_aggregation
+        self.fixtures_dir = fixtures_dir
+        self.random = random.Random(seed)
+
+
+# ✅ Fixtures: recorded when available, synthesized otherwise
+def _load_fixture(config, name):
+    path = os.path.join(config.fixtures_dir, f"{name}.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return None
+
+def _socrata_rows(df):
+    """Socrata returns every scalar as text."""
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.strftime("%Y-%m-%dT%H:%M:%S.000")
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype(str)
+    return df.where(df.notna(), None).to_dict("records")
+
+def build_datasets(config):
+    street = _load_fixture(config, "street_maintenance")
+    if street is None:
+        df = make_street_data(config.street_rows)
+        df["objectid"] = [str(i) for i in range(1, len(df) + 1)]  # Unique keys, like the real dataset
+        street = _socrata_rows(df)
+
+    sf_311 = _load_fixture(config, "sf_311")
+    if sf_311 is None:
+        sf_311 = _socrata_rows(make_311_data(config.sf_311_rows))
+
+    pit_stops = _load_fixture(config, "pit_stops")
+    if pit_stops is None:
+        pit_stops = make_pit_stop_data(config.pit_stop_rows).to_dict("records")
+
+    return {"street_maintenance": street, "sf_311": sf_311, "pit_stops": pit_stops}
+
+
+# ✅ Socrata (the subset of SoQL the app uses)
+_WATERMARK = re.compile(r"(\w+)\s*>\s*'([^']*)'")
+
+def socrata_query(rows, params, server_aggregation=True):
+    match = _WATERMARK.search(params.get("$where", ""))
+    if match:
+        column, value = match.groups()
+        rows = [row for row in rows if (row.get(column) or "") > value]
+
+    select = params.get("$select", "")
+    if "count(*)" in select and "$group" not in params:
+        alias = re.search(r"count\(\*\)\s+AS\s+(\w+)", select, re.I)
+        return [{alias.group(1) if alias else "count": str(len(rows))}]
+
+    if "$group" in params and server_aggregation:
+        keys = [key.strip() for key in params["$group"].split(",")]
+        df = pd.DataFrame(rows)  # Socrata keeps null keys as their own group
+        for col in ("lat", "long"):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        grouped = df.groupby(keys, dropna=False).agg(
+            total_reports=("address", "count"),
+            subtype_reports=("lat", "size"),
+            located_reports=("lat", "count"),
+            lat=("lat", "mean"),
+            long=("long", "mean"),
+        )
+        return _socrata_rows(grouped.reset_index())
+
+    offset = int(params.get("$offset", 0))
+    limit = int(params.get("$limit", 1000))
+    rows = rows[offset:offset + limit]
+
+    if select and "(" not in select:
+        columns = [col.strip() for col in select.split(",")]
+        rows = [{col: row.get(col) for col in columns} for row in rows]
+    return rows
+
+
+# ✅ Keyed APIs
+def _point(text):
+    """Deterministic San Francisco coordinates for any string."""
+    digest = hashlib.sha1(text.lower().encode()).digest()
+    return 37.71 + digest[0] / 255 * 0.09, -122.50 + digest[1] / 255 * 0.12
+
+def geocode_response(config, params):
+    fixture = _load_fixture(config, "geocode")
+    if fixture is not None:
+        return fixture
+
+    address = params.get("address", "")
+    lat, lng = _point(address)
+    return {
+        "status": "OK",
+        "results": [{
+            "formatted_address": f"{address}, USA",
+            "geometry": {"location": {"lat": lat, "lng": lng}},
+            "address_components": [
+                {"long_name": "San Francisco", "short_name": "SF", "types": ["locality", "political"]},
+                {"long_name": "California", "short_name": "CA", "types": ["administrative_area_level_1", "political"]},
+            ],
+        }],
+    }
+
+def nominatim_response(params):
+    query = params.get("q", "")
+    lat, lng = _point(query)
+    return [{
+        "lat": str(lat), "lon": str(lng), "display_name": f"{query}, San Francisco, California, USA",
+        "address": {"city": "San Francisco", "state": "California", "ISO3166-2-lvl4": "US-CA"},
+    }]
+
+def places_response(config, params):
+    fixture = _load_fixture(config, "places")
+    if fixture is not None:
+        return fixture
+
+    lat, lng = (float(part) for part in params.get("location", "37.77,-122.42").split(","))
+    return {
+        "status": "OK",
+        "results": [
+            {"name": f"Recycling Center {i}", "types": ["point_of_interest"],
+             "geometry": {"location": {"lat": lat + 0.01 * i, "lng": lng - 0.01 * i}}}
+            for i in range(5)
+        ],
+    }
+
+def weather_response(config, params):
+    fixture = _load_fixture(config, "weather")
+    if fixture is not None:
+        return fixture
+
+    return {
+        "name": params.get("q", "San Francisco"),
+        "sys": {"country": "US"},
+        "weather": [{"description": "clear sky"}],
+        "main": {"temp": 17.4, "humidity": 72},
+        "wind": {"speed": 4.1},
+    }
+
+def iwaste_response(config, path, params):
+    fixture = _load_fixture(config, "iwaste" + path.replace("/", "_"))
+    if fixture is not None:
+        return fixture
+
+    if path == "/facilities":
+        state = params.get("stateCode", "CA")
+        return {"data": [
+            {"name": f"{state} Facility {i}", "city": "Springfield", "stateCode": state,
+             "facilitySubtypes": "Recycling Center", "contactPhone": "555-0100",
+             "latitude": 37.0 + i * 0.1, "longitude": -120.0 - i * 0.1}
+            for i in range(8)
+        ]}
+    if path == "/categories":
+        return [{"id": 1, "name": "Recyclable"}, {"id": 2, "name": "Compostable"}, {"id": 3, "name": "Landfill"}]
+    return []
+
+CHAT_ANSWER = (
+    '{"category": "Landfill"}\n'
+    "This item is made of mixed materials that local facilities can't separate, "
+    "so it belongs in the black landfill bin. Remove any recyclable parts first."
+)
+
+def chat_chunks(model):
+    words = re.findall(r"\S+\s*|\n", CHAT_ANSWER)
+    for i in range(0, len(words), 3):
+        yield {
+            "id": "chatcmpl-standin", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "delta": {"content": "".join(words[i:i + 3])}, "finish_reason": None}],
+        }
+    yield {
+        "id": "chatcmpl-standin", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+    }
+
+def chat_completion(model):
+    return {
+        "id": "chatcmpl-standin", "object": "chat.completion", "created": int(time.time()), "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": CHAT_ANSWER}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+# ✅ HTTP Server
+def _endpoint_name(path):
+    if path.startswith(IWASTE_PREFIX):
+        return "iwaste"
+    for name, endpoint_path in PATHS.items():
+        if path == endpoint_path:
+            return name
+    return None
+
+def make_handler(config, datasets, stats, stats_lock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real upstreams
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _inject(self, name):
+            """Sleeps for the configured latency; returns True if this request should fail instead."""
+            latency = config.endpoint_latency.get(name, config.latency_ms)
+            jitter = config.random.uniform(-config.jitter_ms, config.jitter_ms) if config.jitter_ms else 0
+            time.sleep(max(latency + jitter, 0) / 1000)
+            return config.random.random() < config.error_rate
+
+        def _route(self, method):
+            url = urlparse(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+            if url.path == "/__stats":
+                with stats_lock:
+                    return self._send_json(200, dict(stats))
+            if url.path == "/__reset" and method == "POST":
+                with stats_lock:
+                    stats.clear()
+                return self._send_json(200, {})
+
+            name = _endpoint_name(url.path)
+            if name is None:
+                return self._send_json(404, {"error": f"No stand-in for {url.path}"})
+
+            body = {}
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+            with stats_lock:
+                stats[name] += 1
+            if self._inject(name):
+                return self._send_json(config.error_status, {"error": "injected failure"})
+
+            if name in datasets:
+                aggregate = config.server_aggregation and name == "sf_311"
+                return self._send_json(200, socrata_query(datasets[name], params, aggregate))
+            if name == "geocode":
+                return self._send_json(200, geocode_response(config, params))
+            if name == "places":
+                return self._send_json(200, places_response(config, params))
+            if name == "weather":
+                return self._send_json(200, weather_response(config, params))
+            if name == "nominatim":
+                return self._send_json(200, nominatim_response(params))
+            if name == "iwaste":
+                return self._send_json(200, iwaste_response(config, url.path[len(IWASTE_PREFIX):], params))
+            if name == "openai":
+                return self._openai(body)
+
+        def _openai(self, body):
+            model = body.get("model", "standin")
+            if not body.get("stream"):
+                return self._send_json(200, chat_completion(model))
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for chunk in chat_chunks(model):
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+
+        def do_GET(self):
+            self._route("GET")
+
+        def do_POST(self):
+            self._route("POST")
+
+    return Handler
+
+def start_server(config=None, host="127.0.0.1", port=0):
+    """
+    Starts the stand-in on a background thread.
+
+    Returns:
+        tuple: (server, base_url, stats). `stats` is a Counter of calls per endpoint name.
+    """
+    config = config or StandinConfig()
+    stats, stats_lock = collections.Counter(), threading.Lock()
+    server = ThreadingHTTPServer((host, port), make_handler(config, build_datasets(config), stats, stats_lock))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="standin-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}", stats
+
+
+# ✅ Recording
+def record_fixtures(fixtures_dir=FIXTURES_DIR, rows=5_000):
+    """Captures replayable responses from the live upstreams (public datasets need no keys)."""
+    import requests
+    from config import settings
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    captures = {
+        "street_maintenance": (settings.STREET_MAINTENANCE, {"$limit": rows, "$order": ":id"}),
+        "sf_311": (settings.SF_311_API_URL, {"$limit": rows, "$where": "lat IS NOT NULL"}),
+        "pit_stops": (settings.SF_PIT_STOP_API_URL, {}),
+        "iwaste_facilities": (f"{settings.IWASTE_API_URL}/facilities", {"stateCode": "CA", "facilityTypeId": "3"}),
+        "iwaste_categories": (f"{settings.IWASTE_API_URL}/categories", {}),
+    }
+    if os.getenv("GOOGLE_MAPS_API_KEY"):
+        key = os.getenv("GOOGLE_MAPS_API_KEY")
+        captures["geocode"] = (settings.GOOGLE_GEOCODING_API_URL, {"address": "Union Square, San Francisco, CA", "key": key})
+        captures["places"] = (settings.GOOGLE_MAPS_API_URL, {"location": "37.7879,-122.4075", "radius": 5000, "keyword": "recycling center", "key": key})
+    if os.getenv("OPENWEATHER_API_KEY"):
+        captures["weather"] = (settings.OPENWEATHER_API_URL, {"q": "San Francisco", "appid": os.getenv("OPENWEATHER_API_KEY"), "units": "metric"})
+
+    for name, (url, params) in captures.items():
+        response = requests.get(url, params=params, timeout=120)
+        response.raise_for_status()
+        with open(os.path.join(fixtures_dir, f"{name}.json"), "w") as f:
+            json.dump(response.json(), f)
+        print(f"Recorded {name}")
+
+
+def _parse_endpoint_latency(values):
+    latencies = {}
+    for value in values or []:
+        name, _, ms = value.partition("=")
+        latencies[name] = float(ms)
+    return latencies
+
+def add_config_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--endpoint-latency", action="append", metavar="NAME=MS",
+                        help=f"Per-endpoint latency; names: {', '.join([*PATHS, 'iwaste'])}")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--street-rows", type=int, default=5_000)
+    parser.add_argument("--sf-311-rows", type=int, default=20_000)
+    parser.add_argument("--pit-stop-rows", type=int, default=300)
+    parser.add_argument("--no-aggregation", action="store_true", help="Ignore SoQL $group, like a plain stand-in")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+
+def config_from_args(args):
+    return StandinConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        error_status=args.error_status, endpoint_latency=_parse_endpoint_latency(args.endpoint_latency),
+        street_rows=args.street_rows, sf_311_rows=args.sf_311_rows, pit_stop_rows=args.pit_stop_rows,
+        server_aggregation=not args.no_aggregation, fixtures_dir=args.fixtures,
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the app's upstream APIs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    add_config_arguments(serve)
+    record = commands.add_parser("record")
+    record.add_argument("--fixtures", default=FIXTURES_DIR)
+    record.add_argument("--rows", type=int, default=5_000)
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record_fixtures(args.fixtures, args.rows)
+        return
+
+    server, base_url, _ = start_server(config_from_args(args), args.host, args.port)
+    print(f"Stand-in upstreams at {base_url}. Point the app at them with:\n")
+    for name, value in upstream_env(base_url).items():
+        print(f"export {name}={value}")
+    print(f"export GEOCODE_PROVIDERS=google\nexport SF_311_SERVER_AGGREGATION={0 if args.no_aggregation else 1}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Load-time benchmark: legacy CSV cache vs. typed Parquet cache.
+
+Run from the repository root:
+    python -m benchmarks.street_cache_load
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+from benchmarks.synthetic import make_street_data
+from benchmarks.timing import best_of
+from services.datasf_analytics_services import preprocess_data, read_parquet_cache, write_parquet_cache
+
+ROW_COUNTS = [1_000, 100_000, 1_000_000]
+PROJECTED_COLUMNS = ["creationdate", "analysis_neighborhoods", "how_many_instances_of_graffiti"]
+
+
+def run():
+    print(f"{'rows':>10} {'csv+preprocess':>16} {'parquet':>10} {'parquet(3 cols)':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in ROW_COUNTS:
+            raw = make_street_data(n_rows)
+            csv_path = os.path.join(tmp, f"street_{n_rows}.csv")
+            parquet_path = os.path.join(tmp, f"street_{n_rows}.parquet")
+            raw.to_csv(csv_path, index=False)
+            write_parquet_cache(preprocess_data(raw.copy()), parquet_path)
+
+            csv_time = best_of(lambda: preprocess_data(pd.read_csv(csv_path, dtype=str)))
+            parquet_time = best_of(lambda: read_parquet_cache(path=parquet_path))
+            projected_time = best_of(lambda: read_parquet_cache(PROJECTED_COLUMNS, path=parquet_path))
+
+            print(f"{n_rows:>10,} {csv_time:>15.3f}s {parquet_time:>9.3f}s {projected_time:>15.3f}s")
+
+
+if __name__ == "__main__":
+    run()
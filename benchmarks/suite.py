@@ -0,0 +1,198 @@
+"""Service-layer micro-benchmarks over synthetic street, SF 311 and Pit Stop data.
+
+Classes follow the asv conventions (`params`, `setup`, `time_*` methods), so they can be
+collected by asv as they are; the runner below times them without it, and
+benchmarks/bench_suite.py runs the same cases under pytest-benchmark. Every network
+call is blocked while benchmarks run, so an unpatched upstream call fails loudly.
+
+Run from the repository root:
+    python -m benchmarks.suite                          # all sizes, 1k-1M rows
+    python -m benchmarks.suite --max-rows 100000 -k pit  # subset
+    python -m benchmarks.suite --json base.json          # save results
+    python -m benchmarks.suite --compare base.json       # flag regressions against a saved run
+"""
+import argparse
+import contextlib
+import json
+from unittest import mock
+
+import requests
+
+from benchmarks.synthetic import make_311_data, make_pit_stop_data, make_street_data, make_top_locations
+from benchmarks.timing import best_of
+import services.datasf_analytics_services as analytics
+import services.recycling_centers as recycling_centers
+import services.sf_data_services as sf_data
+from services import street_rollups
+from services.map_cache import render_html
+from services.spatial_index import SpatialIndex
+
+ROW_COUNTS = [1_000, 10_000, 100_000, 1_000_000]
+SF_CENTER = (37.7879, -122.4075)  # Union Square
+REGRESSION_THRESHOLD = 1.2  # Flag results more than 20% slower than the baseline
+MIN_ROUND_SECONDS = 0.2  # Fast benchmarks are looped until one round takes this long
+
+
+class Preprocess:
+    params = ROW_COUNTS
+
+    def setup(self, n_rows):
+        self.raw = make_street_data(n_rows)
+
+    def time_preprocess_data(self, n_rows):
+        analytics.preprocess_data(self.raw.copy())  # preprocess_data assigns into its input
+
+
+class Trends:
+    params = ROW_COUNTS
+
+    def setup(self, n_rows):
+        self.df = analytics.preprocess_data(make_street_data(n_rows))
+        self.rollup = street_rollups.build_rollup(self.df)
+
+    def time_get_trend_data(self, n_rows):
+        analytics.get_trend_data(self.df)
+
+    def time_get_trend_data_from_rollup(self, n_rows):
+        with mock.patch.object(analytics, "get_street_rollup", return_value=self.rollup):
+            analytics.get_trend_data()
+
+
+class ComplaintHotspots:
+    params = ROW_COUNTS
+
+    def setup(self, n_rows):
+        self.df = make_311_data(n_rows)
+        self.counts = analytics.complaint_counts_from_rows(self.df)
+
+    def time_get_top_complaint_locations_rows(self, n_rows):
+        analytics.get_top_complaint_locations(self.df)
+
+    def time_get_top_complaint_locations_server_counts(self, n_rows):
+        analytics.get_top_complaint_locations(counts=self.counts)
+
+
+class ComplaintMap:
+    params = [10, 1_000, 10_000, 100_000]  # Hotspots on the map, not input rows
+
+    def setup(self, n_points):
+        self.top = make_top_locations(n_points)
+
+    def time_generate_top_complaint_map(self, n_points):
+        analytics.generate_top_complaint_map(self.top)
+
+    def time_generate_and_render_map(self, n_points):
+        render_html(analytics.generate_top_complaint_map(self.top))
+
+
+class PitStops:
+    params = ROW_COUNTS
+
+    def setup(self, n_rows):
+        self.raw = make_pit_stop_data(n_rows)
+        self.df = sf_data.process_pit_stop_data(self.raw.copy())
+        sf_data.filter_nearby_pit_stops(*SF_CENTER, self.df)  # Warm the cached spatial index
+
+    def time_process_pit_stop_data(self, n_rows):
+        sf_data.process_pit_stop_data(self.raw.copy())  # Adds columns to its input
+
+    def time_build_spatial_index(self, n_rows):
+        SpatialIndex(self.df)
+
+    def time_filter_nearby_pit_stops(self, n_rows):
+        sf_data.filter_nearby_pit_stops(*SF_CENTER, self.df, 1)
+
+
+class DisposalSites:
+    params = ROW_COUNTS
+
+    def setup(self, n_rows):
+        self.df = make_311_data(n_rows)
+
+    def time_get_ai_suggested_disposal_sites(self, n_rows):
+        with mock.patch.object(recycling_centers, "get_sf_311_data", return_value=self.df), \
+                mock.patch.object(recycling_centers, "generate_ai_recommendation", return_value=""):
+            recycling_centers.get_ai_suggested_disposal_sites(*SF_CENTER, 2)
+
+
+BENCHMARKS = [Preprocess, Trends, ComplaintHotspots, ComplaintMap, PitStops, DisposalSites]
+
+
+# ✅ Runner
+@contextlib.contextmanager
+def no_network():
+    """Fails any HTTP request made through requests or aiohttp."""
+    def blocked(*args, **kwargs):
+        raise RuntimeError("Network access during a benchmark; patch the upstream call")
+
+    patches = [mock.patch.object(requests.Session, "request", blocked)]
+    try:
+        import aiohttp
+        patches.append(mock.patch.object(aiohttp.ClientSession, "_request", blocked))
+    except ImportError:
+        pass
+
+    with contextlib.ExitStack() as stack:
+        for patch in patches:
+            stack.enter_context(patch)
+        yield
+
+def run(max_rows=None, keyword=None, repeat=3):
+    """Returns {"Class.method[param]": seconds} and prints each result as it completes."""
+    results = {}
+    with no_network():
+        for cls in BENCHMARKS:
+            methods = [name for name in dir(cls) if name.startswith("time_")]
+            for param in cls.params:
+                if max_rows and param > max_rows:
+                    continue
+                selected = [name for name in methods if not keyword or keyword.lower() in f"{cls.__name__}.{name}".lower()]
+                if not selected:
+                    continue
+
+                bench = cls()
+                bench.setup(param)
+                for name in selected:
+                    key = f"{cls.__name__}.{name}[{param}]"
+                    results[key] = best_of(lambda: getattr(bench, name)(param), repeat, min_time=MIN_ROUND_SECONDS)
+                    print(f"{key:<70} {results[key] * 1000:>12.3f}ms", flush=True)
+    return results
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Prints the ratio to the baseline per benchmark; returns the keys slower than `threshold`."""
+    regressions = []
+    print(f"\n{'benchmark':<70} {'baseline':>12} {'now':>12} {'ratio':>7}")
+    for key, seconds in results.items():
+        if key not in baseline:
+            continue
+        ratio = seconds / baseline[key]
+        flag = "  <-- regression" if ratio > threshold else ""
+        print(f"{key:<70} {baseline[key] * 1000:>10.3f}ms {seconds * 1000:>10.3f}ms {ratio:>6.2f}x{flag}")
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Service-layer micro-benchmarks.")
+    parser.add_argument("--max-rows", type=int, help="Skip parameter values above this size")
+    parser.add_argument("-k", dest="keyword", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--compare", dest="baseline_path", help="Compare against results saved with --json")
+    args = parser.parse_args(argv)
+
+    results = run(args.max_rows, args.keyword, args.repeat)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline_path:
+        with open(args.baseline_path) as f:
+            regressions = compare(results, json.load(f))
+        if regressions:
+            raise SystemExit(f"{len(regressions)} benchmark(s) regressed by more than {REGRESSION_THRESHOLD - 1:.0%}")
+
+
+if __name__ == "__main__":
+    main()
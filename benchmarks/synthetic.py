@@ -0,0 +1,74 @@
+"""Synthetic data generators for benchmarks, scaled from the bundled sample data."""
+import numpy as np
+import pandas as pd
+
+SAMPLE_STREET_CSV = "cached_street_data.csv"
+
+
+def make_street_data(n_rows, seed=0):
+    """Raw street maintenance rows (all text, like the API) resampled to `n_rows`."""
+    sample = pd.read_csv(SAMPLE_STREET_CSV, dtype=str)
+    rng = np.random.default_rng(seed)
+    df = sample.iloc[rng.integers(0, len(sample), n_rows)].reset_index(drop=True)
+
+    # Spread creation dates over several years so time-based grouping has real work to do
+    offsets = pd.to_timedelta(rng.integers(0, 4 * 365 * 24 * 3600, n_rows), unit="s")
+    df["creationdate"] = (pd.Timestamp("2021-01-01") + offsets).strftime("%Y-%m-%dT%H:%M:%S.000")
+    return df
+
+
+SF_NEIGHBORHOODS = [
+    "Mission", "Tenderloin", "South of Market", "Bayview Hunters Point", "Financial District",
+    "Castro", "Haight Ashbury", "Nob Hill", "North Beach", "Outer Sunset", "Inner Richmond",
+    "Potrero Hill", "Excelsior", "Western Addition", "Marina", "Chinatown", "Visitacion Valley",
+    "Bernal Heights", "Noe Valley", "Pacific Heights",
+]
+SF_311_SUBTYPES = [
+    "Bulky Items", "General Cleaning", "Human or Animal Waste", "Medical Waste",
+    "Glass", "Refrigerator", "Mattress", "Electronics", "Litter Receptacle",
+]
+
+
+def make_311_data(n_rows, seed=0):
+    """SF 311 waste complaints with the columns the shared loader keeps."""
+    rng = np.random.default_rng(seed)
+    hood_idx = rng.integers(0, len(SF_NEIGHBORHOODS), n_rows)
+    return pd.DataFrame({
+        "service_name": "Street and Sidewalk Cleaning",
+        "service_subtype": np.array(SF_311_SUBTYPES)[rng.integers(0, len(SF_311_SUBTYPES), n_rows)],
+        "service_details": "General Waste",
+        "address": [f"{n} Market St" for n in rng.integers(1, 3000, n_rows)],
+        "lat": 37.70 + 0.10 * rng.random(n_rows) + 0.002 * hood_idx,
+        "long": -122.51 + 0.14 * rng.random(n_rows),
+        "neighborhoods_sffind_boundaries": np.array(SF_NEIGHBORHOODS)[hood_idx],
+        "requested_datetime": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86400, n_rows), unit="s"),
+    })
+
+
+def make_pit_stop_data(n_rows, seed=0):
+    """Raw Pit Stop rows as the API returns them, with GeoJSON points in `location`."""
+    rng = np.random.default_rng(seed)
+    lats = 37.70 + 0.11 * rng.random(n_rows)
+    lngs = -122.51 + 0.14 * rng.random(n_rows)
+    locations = [{"type": "Point", "coordinates": [lng, lat]} for lat, lng in zip(lats, lngs)]
+    if n_rows:
+        locations[0] = None  # The API has the odd row without coordinates
+    return pd.DataFrame({
+        "name": [f"Pit Stop {i}" for i in range(n_rows)],
+        "address": [f"{n} Mission St" for n in rng.integers(1, 3000, n_rows)],
+        "hours": np.array(["24/7", "7am - 11pm", "8am - 8pm"])[rng.integers(0, 3, n_rows)],
+        "neighborhood": np.array(SF_NEIGHBORHOODS)[rng.integers(0, len(SF_NEIGHBORHOODS), n_rows)],
+        "location": locations,
+    })
+
+
+def make_top_locations(n_rows, seed=0):
+    """A `get_top_complaint_locations`-shaped frame with `n_rows` hotspots, for map rendering."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "neighborhoods_sffind_boundaries": [f"{SF_NEIGHBORHOODS[i % len(SF_NEIGHBORHOODS)]} {i}" for i in range(n_rows)],
+        "total_reports": rng.integers(1, 5000, n_rows),
+        "common_complaint": np.array(SF_311_SUBTYPES)[rng.integers(0, len(SF_311_SUBTYPES), n_rows)],
+        "lat": 37.70 + 0.11 * rng.random(n_rows),
+        "long": -122.51 + 0.14 * rng.random(n_rows),
+    })
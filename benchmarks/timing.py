@@ -0,0 +1,28 @@
+"""Timing helper shared by the benchmark scripts."""
+import time
+
+
+def best_of(fn, repeat=3, min_time=0.0):
+    """
+    Best per-call time of `fn()` in seconds over `repeat` rounds.
+
+    With `min_time`, fast calls are looped (10x at a time, up to 1,000 per round) until a
+    round takes at least that long, so timer resolution doesn't dominate the result.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000:
+            break
+        number *= 10
+
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
@@ -0,0 +1,40 @@
+"""Trend benchmark: regrouping every street row per call vs. querying the precomputed rollup.
+
+Run from the repository root:
+    python -m benchmarks.trend_rollups
+"""
+import pandas as pd
+
+from benchmarks.synthetic import make_street_data
+from benchmarks.timing import best_of
+from services.datasf_analytics_services import TREND_COLUMNS, preprocess_data
+from services import street_rollups as rollups
+
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+
+
+def legacy_trend(df):
+    """The previous get_trend_data (on a copy, since it mutated its input)."""
+    df = df.copy()
+    df["month"] = pd.to_datetime(df["creationdate"]).dt.to_period("M")
+    df[TREND_COLUMNS] = df[TREND_COLUMNS].apply(pd.to_numeric, errors="coerce")
+    trend_df = df.groupby("month")[TREND_COLUMNS].sum()
+    trend_df.index = trend_df.index.astype(str)
+    return trend_df
+
+
+def run():
+    print(f"{'rows':>10} {'legacy':>10} {'build rollup':>13} {'rollup query':>13} {'rollup rows':>12}")
+    for n_rows in ROW_COUNTS:
+        df = preprocess_data(make_street_data(n_rows))
+        rollup = rollups.build_rollup(df)
+        assert (legacy_trend(df).astype(float).values == rollups.monthly(rollup, TREND_COLUMNS).astype(float).values).all()
+
+        legacy = best_of(lambda: legacy_trend(df))
+        build = best_of(lambda: rollups.build_rollup(df))
+        query = best_of(lambda: rollups.monthly(rollup, TREND_COLUMNS))
+        print(f"{n_rows:>10,} {legacy:>9.3f}s {build:>12.3f}s {query * 1000:>11.2f}ms {len(rollup):>12,}")
+
+
+if __name__ == "__main__":
+    run()
@@ -1,30 +1,128 @@
+import base64
+import json
 import os
-import streamlit as st
-from dotenv import load_dotenv
+from functools import lru_cache
 
 RUNNING_IN_STREAMLIT = "STREAMLIT_SERVER_RUN_ONCE" in os.environ
 
 # Securely fetch API keys
 RUNNING_IN_STREAMLIT = True 
-if RUNNING_IN_STREAMLIT:
-    # ✅ Load from Streamlit Secrets in the cloud
-    OPENAI_API_KEY = st.secrets["OPENAI_API_KEY"]
-    GOOGLE_MAPS_API_KEY = st.secrets["GOOGLE_MAPS_API_KEY"]
-    OPENWEATHER_API_KEY = st.secrets["OPENWEATHER_API_KEY"]
-    print("🔹 Using Streamlit Secrets for API keys (Cloud Mode)")
-else:
+
+API_KEY_NAMES = ("OPENAI_API_KEY", "GOOGLE_MAPS_API_KEY", "OPENWEATHER_API_KEY")
+
+@lru_cache(maxsize=1)
+def load_api_keys():
+    """Reads the API keys once, on first use, so importing settings does no I/O."""
+    if RUNNING_IN_STREAMLIT:
+        # ✅ Load from Streamlit Secrets in the cloud
+        import streamlit as st
+        print("🔹 Using Streamlit Secrets for API keys (Cloud Mode)")
+        return {name: st.secrets[name] for name in API_KEY_NAMES}
+
     # ✅ Load from .env file locally
+    from dotenv import load_dotenv
     load_dotenv()
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
-    OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
     print("🔹 Using .env file for API keys (Local Mode)")
+    return {name: os.getenv(name) for name in API_KEY_NAMES}
+
+def __getattr__(name):
+    # ✅ `settings.OPENAI_API_KEY` etc. resolve lazily through load_api_keys()
+    if name in API_KEY_NAMES:
+        return load_api_keys()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@lru_cache(maxsize=1)
+def configure_google_credentials():
+    """Points GOOGLE_APPLICATION_CREDENTIALS at a key file; runs once, before the first Vision call."""
+    if RUNNING_IN_STREAMLIT:
+        import streamlit as st
+
+        if "google_cloud" in st.secrets and "GOOGLE_CLOUD_KEY" in st.secrets["google_cloud"]:
+            google_cloud_json_str = st.secrets["google_cloud"]["GOOGLE_CLOUD_KEY"]
+            google_cloud_json = json.loads(base64.b64decode(google_cloud_json_str))
+
+            # ✅ Write to a temporary JSON file
+            temp_gcloud_path = "/tmp/gcloud_key.json"
+            with open(temp_gcloud_path, "w") as f:
+                json.dump(google_cloud_json, f)
+
+            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = temp_gcloud_path
+            print(f"✅ Google Cloud credentials successfully written to {temp_gcloud_path}")
+        else:
+            raise FileNotFoundError("❌ Google Cloud key not found in Streamlit Secrets!")
+
+    else:
+        # ✅ Load from .env for local development
+        from dotenv import load_dotenv
+        load_dotenv()
+
+        google_cloud_credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+
+        if google_cloud_credentials_path and os.path.exists(google_cloud_credentials_path):
+            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = google_cloud_credentials_path
+            print(f"✅ Running Locally - Using: {google_cloud_credentials_path}")
+        else:
+            raise FileNotFoundError("❌ Google Cloud credentials not found! Check .env file.")
+
+
+# API Base URLs (each can be pointed at a local stand-in via the environment, see benchmarks/standin_server.py)
+IWASTE_API_URL = os.getenv("IWASTE_API_URL", "https://iwaste.epa.gov/api")
+GOOGLE_MAPS_API_URL = os.getenv("GOOGLE_MAPS_API_URL", "https://maps.googleapis.com/maps/api/place/nearbysearch/json")
+GOOGLE_GEOCODING_API_URL = os.getenv("GOOGLE_GEOCODING_API_URL", "https://maps.googleapis.com/maps/api/geocode/json")
+OPENWEATHER_API_URL = os.getenv("OPENWEATHER_API_URL", "https://api.openweathermap.org/data/2.5/weather")
+STREET_MAINTENANCE = os.getenv("STREET_MAINTENANCE", "https://data.sfgov.org/resource/qya8-uhsz.json")
+SF_PIT_STOP_API_URL = os.getenv("SF_PIT_STOP_API_URL", "https://data.sfgov.org/resource/mr6h-cr3u.json")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # None = OpenAI's default endpoint
+NOMINATIM_DOMAIN = os.getenv("NOMINATIM_DOMAIN", "nominatim.openstreetmap.org")
+NOMINATIM_SCHEME = os.getenv("NOMINATIM_SCHEME", "https")
+
+# Persistent result caches (SQLite, shared across sessions and processes)
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", ".cache/results.sqlite3")
+CLASSIFICATION_CACHE_TTL = 30 * 24 * 3600  # 30 days
+CLASSIFICATION_CACHE_MAX_ENTRIES = 50000
+
+# Local lexicon classifier: below this confidence the item goes to OpenAI
+LEXICON_CONFIDENCE_THRESHOLD = 0.8
+
+# Batch classification: concurrent OpenAI requests per run
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "8"))
+
+# Image analysis cache: exact content hash plus perceptual hash for near-duplicates
+IMAGE_CACHE_TTL = 7 * 24 * 3600  # 7 days
+IMAGE_CACHE_MAX_ENTRIES = 5000
+IMAGE_PHASH_MAX_DISTANCE = 4  # Max differing bits (of 64) to treat two images as the same photo
+
+# SF 311 cases: one shared, server-filtered loader (services/sf_311_data.py)
+SF_311_API_URL = os.getenv("SF_311_API_URL", "https://data.sfgov.org/resource/vw6y-z8j6.json")
+SF_311_WASTE_SERVICE_NAMES = ("Street and Sidewalk Cleaning", "Litter Receptacles", "Illegal Dumping")
+SF_311_ROW_LIMIT = 50000
+SF_311_CACHE_TTL = 3600  # 1 hour
+SF_311_SERVER_AGGREGATION = os.getenv("SF_311_SERVER_AGGREGATION", "1") == "1"  # Set to 0 for stand-ins without SoQL $group
+
+# Rendered map HTML cache, keyed by a hash of the map inputs (services/map_cache.py)
+MAP_CACHE_DIR = os.getenv("MAP_CACHE_DIR", ".cache/maps")
+MAP_CACHE_MEMORY_ENTRIES = 64
+MAP_CACHE_DISK_ENTRIES = 500
 
-# Load environment variables
+# Geocoding: one cached service with a provider fallback chain (services/geocoding.py)
+GEOCODE_PROVIDERS = tuple(p.strip() for p in os.getenv("GEOCODE_PROVIDERS", "google,nominatim").split(",") if p.strip())
+GEOCODE_CACHE_TTL = 90 * 24 * 3600  # 90 days; addresses rarely move
+GEOCODE_NEGATIVE_CACHE_TTL = 24 * 3600  # 1 day for addresses no provider could resolve
+GEOCODE_CACHE_MAX_ENTRIES = 100000
+GEOCODE_MAX_WORKERS = 8
+NOMINATIM_MIN_INTERVAL = 1.0  # Seconds between requests, per the Nominatim usage policy
 
+# Session-start prefetch: all independent upstream fetches run concurrently (services/prefetch.py)
+PREFETCH_MAX_CONCURRENCY = int(os.getenv("PREFETCH_MAX_CONCURRENCY", "8"))  # Requests in flight, process-wide
+PREFETCH_TIMEOUT = 60  # Seconds per request
+PREFETCH_TTL = 3600  # A new round of prefetches starts after this many seconds
+DEFAULT_SF_LOCATION = "Union Square, San Francisco, CA"
 
-# API Base URLs
-IWASTE_API_URL = "https://iwaste.epa.gov/api"
-GOOGLE_MAPS_API_URL = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
-OPENWEATHER_API_URL = "https://api.openweathermap.org/data/2.5/weather"
-STREET_MAINTENANCE= "https://data.sfgov.org/resource/qya8-uhsz.json"
\ No newline at end of file
+# Stale-while-revalidate dataset refresh (services/refresh_scheduler.py)
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", ".cache/snapshots")  # Warm-start copies of each dataset
+REFRESH_AHEAD_FRACTION = 0.8  # Refresh once a dataset is this far into its interval
+REFRESH_CHECK_SECONDS = 30
+REFRESH_RETRY_SECONDS = 60  # Wait after a failed refresh before trying again
+REFRESH_IDLE_EXPIRY = 24 * 3600  # Per-key entries (e.g. one city's weather) nobody read for this long stop refreshing
+PIT_STOP_REFRESH_INTERVAL = 6 * 3600
+WEATHER_REFRESH_INTERVAL = 1800
@@ -0,0 +1,93 @@
+"""
+Bulk waste classification from the command line.
+
+Usage (from the repository root):
+    python -m services.batch_classification manifest.csv -o results.jsonl
+    python -m services.batch_classification items.jsonl -o results.csv --field name --concurrency 16
+
+Input is a CSV (item text in `--column`) or a JSONL file (item text in `--field`).
+Results are written as each unique item finishes, one output row per input line.
+"""
+import argparse
+import csv
+import json
+import sys
+
+from config.settings import BATCH_MAX_WORKERS
+from services.waste_classification import classify_many
+from services.waste_lexicon import normalize_item
+
+OUTPUT_FIELDS = ["line", "item", "category", "bin", "explanation", "error"]
+
+
+def read_items(path, column="item"):
+    """Reads item text from a CSV column or a JSONL field, skipping blank entries."""
+    items = []
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            records = (json.loads(line) for line in f if line.strip())
+        else:
+            records = csv.DictReader(f)
+
+        for record in records:
+            value = (record.get(column) or "").strip()
+            if value:
+                items.append(value)
+    return items
+
+
+class ResultWriter:
+    """Writes one CSV or JSONL row per input line, flushing after every unique item."""
+
+    def __init__(self, f, path):
+        self._f = f
+        self._csv = None
+        if not path.endswith(".jsonl"):
+            self._csv = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, line, item, result):
+        row = {"line": line, "item": item, **result}
+        if self._csv:
+            self._csv.writerow(row)
+        else:
+            self._f.write(json.dumps({key: row.get(key) for key in OUTPUT_FIELDS if key in row}) + "\n")
+
+    def flush(self):
+        self._f.flush()
+
+
+def run(input_path, output_path, column="item", concurrency=BATCH_MAX_WORKERS):
+    items = read_items(input_path, column)
+
+    # Input lines per unique item, so duplicates are written when their item completes
+    lines_by_key = {}
+    for line, item in enumerate(items, start=1):
+        lines_by_key.setdefault(normalize_item(item), []).append((line, item))
+
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = ResultWriter(f, output_path)
+
+        def on_result(key, result):
+            for line, item in lines_by_key[key]:
+                writer.write(line, item, result)
+            writer.flush()
+
+        classify_many(items, max_workers=concurrency, on_result=on_result)
+
+    print(f"Classified {len(items)} items ({len(lines_by_key)} unique) -> {output_path}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify a CSV or JSONL list of waste items.")
+    parser.add_argument("input", help="CSV or JSONL file of items")
+    parser.add_argument("-o", "--output", required=True, help="Output file (.csv or .jsonl)")
+    parser.add_argument("--column", "--field", dest="column", default="item", help="CSV column / JSON field holding the item text")
+    parser.add_argument("--concurrency", type=int, default=BATCH_MAX_WORKERS, help="Maximum concurrent classifications")
+    args = parser.parse_args(argv)
+
+    run(args.input, args.output, args.column, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
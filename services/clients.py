@@ -0,0 +1,59 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import config.settings as settings
+
+# Keep-alive pool sizing: one pool per upstream host, enough connections per host
+# for the largest worker pool that talks to it (sync engine, batch classification)
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 32
+HTTP_RETRIES = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=["GET"])
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _get_or_create(name, factory):
+    """Returns the process-wide client `name`, creating it once under a lock."""
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = factory()
+                _clients[name] = client
+    return client
+
+def _create_http_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=HTTP_RETRIES,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# ✅ Shared Clients (SDKs are imported on first use)
+def get_http_session():
+    """Pooled keep-alive `requests.Session` for all plain HTTP calls."""
+    return _get_or_create("http", _create_http_session)
+
+def get_openai_client():
+    import openai
+    return _get_or_create(
+        "openai", lambda: openai.OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+    )
+
+def get_vision_client():
+    from google.cloud import vision
+
+    def create():
+        settings.configure_google_credentials()
+        return vision.ImageAnnotatorClient()
+
+    return _get_or_create("vision", create)
@@ -1,62 +1,178 @@
 import pandas as pd
 import requests
 import os
+import threading
 import streamlit as st
-from config.settings import STREET_MAINTENANCE  # Import API URLs dynamically
+import services.street_data_sync as street_sync
+import services.street_rollups as rollups
+from services.frame_schema import STREET_SCHEMA, fill_missing, optimize_frame
+from services.spatial_index import get_spatial_index
+from services.sf_311_data import get_sf_311_data, get_complaint_counts  # Shared, cached SF 311 loaders
+from config.settings import SF_311_SERVER_AGGREGATION
 import folium
-import matplotlib.pyplot as plt
-import seaborn as sns
-from streamlit_folium import folium_static
-from geopy.distance import geodesic
+from services.map_cache import get_map_html
+from services.map_rendering import add_points
+from services.refresh_scheduler import scheduler
 
 
 CACHE_FILE = "cached_street_data.csv"
+PARQUET_CACHE_FILE = "cached_street_data.parquet"
+ROLLUP_FILE = "street_rollups.parquet"
 
-# ✅ Fetch API Data with Structured Query Parameters & Pagination
+# ✅ Fetch API Data (full dataset, paged concurrently by the sync engine)
 @st.cache_data(ttl=3600)  # Cache API data for 1 hour
 def fetch_api_data():
-    """Fetches waste management data from API, with pagination and structured parameters."""
-    url = STREET_MAINTENANCE
-    
-    params = {
-        "limit": 1000,  # Fetch large chunks of data if applicable
-        "offset": 0,  # Used for pagination if API supports it
-    }
-    
-    response = requests.get(url, params=params)
+    """Fetches the complete street maintenance dataset from the API, page by page."""
+    try:
+        df = street_sync.fetch_rows()
+    except requests.exceptions.RequestException as e:
+        st.error(f"⚠️ API Error: {e}")
+        return pd.DataFrame()
 
-    if response.status_code == 200:
-        data = response.json()
-        
-        if not data:  # If API returns an empty dataset
-            st.warning("⚠️ API returned no data.")
-            return pd.DataFrame()
+    if df.empty:  # If API returns an empty dataset
+        st.warning("⚠️ API returned no data.")
 
-        df = pd.DataFrame(data)
+    return df
 
-        # Debugging: Show sample data
-        st.write("✅ API Data Sample:", df.head(3))
+# ✅ Columnar Cache (Parquet) of the Already-Preprocessed Frame
+def write_parquet_cache(df, path=PARQUET_CACHE_FILE):
+    """Stores a preprocessed frame as Parquet so dtypes survive the round-trip."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)  # Sessions memory-mapping the old file never see a partial one
+
+def read_parquet_cache(columns=None, path=PARQUET_CACHE_FILE):
+    """Memory-mapped Parquet read, loading only the requested columns."""
+    return pd.read_parquet(path, columns=columns, memory_map=True)
+
+def migrate_csv_cache(csv_path=CACHE_FILE, parquet_path=PARQUET_CACHE_FILE):
+    """One-time migration of the legacy CSV cache into the typed Parquet cache."""
+    # Read everything as text so coded answers match the API's string values ("1", "2", ...)
+    df = preprocess_data(pd.read_csv(csv_path, dtype=str))
+    write_parquet_cache(df, parquet_path)
+    return df
 
-        return df  # Convert API response to DataFrame
-    
+# ✅ Incremental Sync into the Local Cache
+_sync_lock = threading.Lock()
+
+def sync_street_cache():
+    """Scheduler loader: one incremental sync into the Parquet cache. Errors propagate."""
+    with _sync_lock:
+        new_rows, state = street_sync.sync_street_data(street_sync.load_sync_state())
+        _merge_into_cache(new_rows, state)
+    return state
+
+# The Parquet file is the street data's own snapshot; the scheduler only tracks sync state
+scheduler.register("street_data", sync_street_cache, interval=street_sync.SYNC_INTERVAL_SECONDS, snapshot=False)
+
+def schedule_street_sync(wait):
+    """Starts a due street sync through the scheduler; with `wait`, blocks only if nothing was ever synced."""
+    state = street_sync.load_sync_state()
+    if os.path.exists(PARQUET_CACHE_FILE) and state.get("last_sync"):
+        # A previous process already synced: the next sync is due relative to that, not to now
+        scheduler.seed("street_data", state, refreshed_at=state["last_sync"])
+    scheduler.get("street_data", wait=wait)
+
+def _merge_into_cache(new_rows, state):
+    if os.path.exists(PARQUET_CACHE_FILE):
+        cached = read_parquet_cache()
+    elif os.path.exists(CACHE_FILE):
+        cached = migrate_csv_cache()
     else:
-        st.error(f"⚠️ API Error: {response.status_code}")
-        return pd.DataFrame()
+        cached = pd.DataFrame()
+
+    if not new_rows.empty:
+        new_df = preprocess_data(new_rows)
+        # Concatenating categoricals with different categories falls back to object; re-compact
+        merged = optimize_frame(street_sync.merge_rows(cached, new_df), STREET_SCHEMA)
+        write_parquet_cache(merged)
+        _update_rollup(cached, new_df, merged)
+
+    street_sync.save_sync_state(state)
+
+# ✅ Month × Neighborhood × Route Type Rollups (kept in step with the Parquet cache)
+_rollup_memo = {}
+
+def _cached_row_count(path=PARQUET_CACHE_FILE):
+    import pyarrow.parquet as pq
+    return pq.read_metadata(path).num_rows
+
+def _read_rollup(path=ROLLUP_FILE):
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+def _write_rollup(rollup, path=ROLLUP_FILE):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    rollup.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def _update_rollup(cached, new_df, merged):
+    """
+    Adds just the newly synced rows to the stored rollup. It is rebuilt instead when it was
+    out of step, or when the batch replaces cached rows (e.g. a full sync over a migrated CSV
+    cache), since the replaced rows' old values are already counted in it.
+    """
+    rollup = _read_rollup()
+    added = street_sync.unseen_rows(cached, new_df)
+    replaces_rows = len(added) < len(new_df.drop_duplicates(subset=list(street_sync.KEY_COLUMNS)))
+    if rollup is None or replaces_rows or rollups.total_rows(rollup) != len(cached):
+        rollup = rollups.build_rollup(merged)
+    else:
+        rollup = rollups.combine(rollup, rollups.build_rollup(added))
+    _write_rollup(rollup)
+
+def get_street_rollup():
+    """
+    The month × `analysis_neighborhoods` × `route_type` rollup of the street data.
+
+    It is rebuilt from the Parquet cache only when missing or out of step with it (one full
+    pass per data version); syncs extend it incrementally. Repeat calls are served from memory.
+    """
+    if not _ensure_street_cache():
+        return rollups.empty_rollup()
+
+    key = os.stat(PARQUET_CACHE_FILE).st_mtime_ns
+    if key not in _rollup_memo:
+        rollup = _read_rollup()
+        if rollup is None or rollups.total_rows(rollup) != _cached_row_count():
+            columns = ["creationdate", "analysis_neighborhoods", "route_type", "cleanliness_level", *rollups.SUM_COLUMNS]
+            rollup = rollups.build_rollup(read_parquet_cache(columns))
+            _write_rollup(rollup)
+        _rollup_memo.clear()
+        _rollup_memo[key] = rollup
+    return _rollup_memo[key]
 
 # ✅ Load Data Efficiently with Local Caching
-def load_data():
-    if os.path.exists(CACHE_FILE):
-        
-        return pd.read_csv(CACHE_FILE)
-    
-    df = fetch_api_data()
-
-    if not df.empty:
-        df.to_csv(CACHE_FILE, index=False)  # Save data locally
-    else:
+def _upgrade_parquet_cache(path=PARQUET_CACHE_FILE):
+    """Rewrites a cache written before the compact schema (object ids, text columns) once."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if pa.types.is_integer(pq.read_schema(path).field("objectid").type):
+        return
+    with _sync_lock:
+        write_parquet_cache(optimize_frame(read_parquet_cache(path=path), STREET_SCHEMA), path)
+
+def _ensure_street_cache():
+    """Makes sure a Parquet cache exists and a due sync is scheduled; False if there is no data at all."""
+    if not os.path.exists(PARQUET_CACHE_FILE) and os.path.exists(CACHE_FILE):
+        migrate_csv_cache()
+    elif os.path.exists(PARQUET_CACHE_FILE):
+        _upgrade_parquet_cache()
+
+    # ✅ Serve the cached Parquet while a due sync runs in the background; block only with no cache at all
+    schedule_street_sync(wait=not os.path.exists(PARQUET_CACHE_FILE))
+
+    if not os.path.exists(PARQUET_CACHE_FILE):
         st.warning("⚠️ No data available to cache.")
+        return False
+    return True
 
-    return df
+def load_data(columns=None):
+    """Returns the preprocessed street data, optionally projected to `columns`."""
+    if not _ensure_street_cache():
+        return pd.DataFrame()
+
+    return read_parquet_cache(columns)
 
 # ✅ Preprocess Data
 def preprocess_data(df):
@@ -80,94 +196,149 @@ def preprocess_data(df):
     df["route_type"] = df["is_this_route_predominantly"].map(route_type_mapping)
     df["cleanliness_level"] = df["select_the_statement_that"].map(cleanliness_mapping)
 
-    return df
+    # ✅ Compact dtypes: categoricals, small/nullable ints; unused free-text columns dropped
+    return optimize_frame(df, STREET_SCHEMA)
 
 # ✅ Fetch & Process Data
-def get_cleaned_data():
-    df = load_data()
-    return preprocess_data(df)
+def get_cleaned_data(columns=None):
+    """Loads the typed street data; the Parquet cache is already preprocessed."""
+    return load_data(columns)
 
 # ✅ Analytics Functions
-def get_trend_data(df):
-    if df.empty:
-        return pd.DataFrame()
-    
-    df["month"] = pd.to_datetime(df["creationdate"]).dt.to_period("M")
-
-    # Ensure numeric conversion
-    numeric_cols = ["how_many_instances_of_graffiti", "how_many_instances_of_feces"]
-    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
+TREND_COLUMNS = ["how_many_instances_of_graffiti", "how_many_instances_of_feces"]
 
-    # Group by month and sum the values
-    trend_df = df.groupby("month")[numeric_cols].sum()
+def get_trend_data(df=None, neighborhood=None, route_type=None):
+    """
+    Monthly graffiti and feces totals, indexed by "YYYY-MM".
 
-    # Ensure index is converted back to string for plotting
-    trend_df.index = trend_df.index.astype(str)
+    With no `df`, reads the precomputed rollup of the cached street data; a passed frame
+    is rolled up on the fly. Either way the caller's frame is left untouched.
+    """
+    rollup = get_street_rollup() if df is None else rollups.build_rollup(df)
+    if rollup.empty:
+        return pd.DataFrame()
 
-    return trend_df
+    return rollups.monthly(rollup, TREND_COLUMNS, neighborhood, route_type)
 
 def get_high_risk_areas(df):
+    """Rows meeting the high-risk rule; for counts per area use `get_high_risk_summary`."""
     if df.empty:
         return pd.DataFrame()
     
-    return df[(df["how_many_instances_of_graffiti"] > 10) | (df["how_many_instances_of_feces"] > 5)]
+    return df[rollups.is_high_risk(df)]
 
+def get_high_risk_summary(by="analysis_neighborhoods", start=None, end=None):
+    """High-risk route evaluations per neighborhood (or route type / month), from the rollup."""
+    rollup = get_street_rollup()
+    if rollup.empty:
+        return pd.DataFrame()
 
+    return rollups.high_risk_summary(rollup, by, start, end)
 
 
-SF_311_API_URL = "https://data.sfgov.org/resource/vw6y-z8j6.json"
 
-def get_sf_311_data():
-    """Fetch SF 311 waste complaints and return as a DataFrame."""
-    response = requests.get(SF_311_API_URL)
-    
-    if response.status_code == 200:
-        data = response.json()
-        df = pd.DataFrame(data)
 
-        # ✅ Keep only relevant columns
-        df = df[["service_subtype", "service_details", "address", "lat", "long", "neighborhoods_sffind_boundaries"]]
-        df.dropna(subset=["lat", "long", "neighborhoods_sffind_boundaries"], inplace=True)
+def get_complaints_near(df, lat, lng, radius_km=1):
+    """SF 311 complaints within `radius_km` of a point, nearest first."""
+    if df.empty:
+        return pd.DataFrame()
 
-        # ✅ Convert lat/long to float
-        df["lat"] = df["lat"].astype(float)
-        df["long"] = df["long"].astype(float)
+    return get_spatial_index("sf_311", df, "lat", "long").within(lat, lng, radius_km)
 
-        return df
-    else:
-        return pd.DataFrame()
+def complaint_counts_from_rows(df):
+    """
+    Local equivalent of the server-side aggregate: one grouped pass over raw 311 rows
+    producing count and mean coordinates per (neighborhood, subtype) pair.
+    """
+    rows = df.dropna(subset=["neighborhoods_sffind_boundaries"])
 
-def get_top_complaint_locations(df, top_n=10):
-    """Get the top complaint locations (neighborhoods) based on frequency."""
-    top_neighborhoods = (
-        df.groupby("neighborhoods_sffind_boundaries")
+    # Missing subtypes keep their own group: they count towards the total but never win common_complaint
+    return (
+        rows.groupby(["neighborhoods_sffind_boundaries", "service_subtype"], observed=True, sort=False, dropna=False)
         .agg(
             total_reports=("address", "count"),
-            common_complaint=("service_subtype", lambda x: x.mode().iloc[0] if not x.empty and not x.mode().empty else "Unknown")
+            subtype_reports=("lat", "size"),
+            located_reports=("lat", "count"),
+            lat=("lat", "mean"),
+            long=("long", "mean"),
         )
         .reset_index()
+    )
+
+def top_locations_from_counts(counts, top_n=10):
+    """Top neighborhoods from per-(neighborhood, subtype) counts, e.g. server-side aggregates."""
+    if counts.empty:
+        return pd.DataFrame()
+
+    # Count-weighted mean of the per-subtype mean coordinates = neighborhood mean
+    located = counts["located_reports"] if "located_reports" in counts else counts["total_reports"]
+    weighted = counts.assign(lat=counts["lat"] * located, long=counts["long"] * located, located_reports=located)
+    per_neighborhood = weighted.groupby("neighborhoods_sffind_boundaries", observed=True)[
+        ["total_reports", "located_reports", "lat", "long"]
+    ].sum()
+    per_neighborhood["lat"] /= per_neighborhood["located_reports"]
+    per_neighborhood["long"] /= per_neighborhood["located_reports"]
+
+    # Like Series.mode(): missing subtypes are ignored and ties go to the alphabetically first subtype
+    named = counts.dropna(subset=["service_subtype"])
+    ranked = named.assign(
+        subtype_reports=named["subtype_reports"] if "subtype_reports" in named else named["total_reports"],
+        subtype_name=named["service_subtype"].astype(str),
+    ).sort_values(["subtype_reports", "subtype_name"], ascending=[False, True], kind="stable")
+    most_common = ranked.drop_duplicates("neighborhoods_sffind_boundaries")
+    common = most_common.set_index("neighborhoods_sffind_boundaries")["service_subtype"]
+    per_neighborhood["common_complaint"] = fill_missing(common.reindex(per_neighborhood.index), "Unknown")
+
+    return (
+        per_neighborhood.reset_index()
+        .astype({"total_reports": int})
         .sort_values(by="total_reports", ascending=False)
         .head(top_n)
+        [["neighborhoods_sffind_boundaries", "total_reports", "common_complaint", "lat", "long"]]
     )
-    return top_neighborhoods
 
-def generate_top_complaint_map(df, top_locations):
-    """Generate a map of the top complaint locations."""
-    if df.empty or top_locations.empty:
+def get_top_complaint_locations(df=None, top_n=10, counts=None):
+    """
+    Get the top complaint locations (neighborhoods) based on frequency.
+
+    With no `df`, counts are aggregated by Socrata ($group) and only the small result
+    is transferred; pass `counts` when they were already fetched.
+    If the server can't aggregate, raw rows are aggregated locally.
+    """
+    if df is None:
+        if counts is None and SF_311_SERVER_AGGREGATION:
+            counts = get_complaint_counts()
+        if counts is not None:
+            return top_locations_from_counts(counts, top_n)
+        df = get_sf_311_data()  # ✅ Fallback: raw-row path
+
+    if df.empty:
+        return pd.DataFrame()
+
+    return top_locations_from_counts(complaint_counts_from_rows(df), top_n)
+
+def generate_top_complaint_map(top_locations):
+    """Generate a map of the top complaint locations (needs `lat`/`long` per neighborhood)."""
+    if top_locations.empty:
         return None
 
     sf_map = folium.Map(location=[37.7749, -122.4194], zoom_start=12)
 
-    for _, row in top_locations.iterrows():
-        # Get representative coordinates from SF 311 data for this neighborhood
-        neighborhood_df = df[df["neighborhoods_sffind_boundaries"] == row["neighborhoods_sffind_boundaries"]]
-        lat, lng = neighborhood_df[["lat", "long"]].mean()  # Use average coordinates to represent the area
-
-        folium.Marker(
-            [lat, lng],
-            popup=f"<b>{row['neighborhoods_sffind_boundaries']}</b><br>Reports: {row['total_reports']}<br>Common Issue: {row['common_complaint']}",
-            tooltip=row["neighborhoods_sffind_boundaries"],
-            icon=folium.Icon(color="red", icon="info-sign")
-        ).add_to(sf_map)
+    names = top_locations["neighborhoods_sffind_boundaries"].astype(str)
+    popups = (
+        "<b>" + names + "</b><br>Reports: " + top_locations["total_reports"].astype(str)
+        + "<br>Common Issue: " + top_locations["common_complaint"].astype(str)
+    )
+    add_points(sf_map, top_locations["lat"], top_locations["long"], popups=popups, tooltips=names, color="red")
 
     return sf_map
+
+def get_top_complaint_map_html(top_locations):
+    """Rendered hotspot map HTML, rebuilt only when the top locations change."""
+    if top_locations.empty:
+        return None
+
+    return get_map_html(
+        ("complaint_hotspots", top_locations.to_dict("records")),
+        lambda: generate_top_complaint_map(top_locations),
+    )
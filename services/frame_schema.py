@@ -0,0 +1,139 @@
+import pandas as pd
+
+# ✅ Column kinds -> pandas dtypes
+#   category: repeated strings (neighborhoods, route names, periods, coded multi-selects)
+#   code:     coded survey answers, 0–5
+#   count:    "how many" answers; nullable so blanks stay blank instead of becoming 0.0
+#   id:       integer identifiers
+#   datetime / float / text: kept as parsed timestamps, floats and plain strings
+KIND_DTYPES = {
+    "category": "category",
+    "code": "Int8",
+    "count": "Int32",
+    "id": "Int64",
+    "float": "float64",
+}
+
+# Street maintenance evaluations; columns not listed (free-text "other" answers) are dropped
+STREET_SCHEMA = {
+    "route_id": "id",
+    "route_location": "category",
+    "is_this_route_predominantly": "code",
+    "select_the_statement_that": "code",
+    "objectid": "id",
+    "does_litter_obstruct_the": "code",
+    "select_the_statement_that_1": "code",
+    "how_many_large_abandoned": "count",
+    "how_many_instances_of_graffiti": "count",
+    "how_many_instances_of_graffiti_1": "count",
+    "how_many_instances_of_graffiti_2": "count",
+    "select_the_statement_that_2": "code",
+    "how_many_instances_of_feces": "count",
+    "how_many_abandoned_syringes": "count",
+    "how_many_used_or_opened": "count",
+    "how_many_dead_animals_are": "count",
+    "does_the_route_have_one_or": "code",
+    "are_any_trash_receptacles": "code",
+    "is_sidewalk_clearance_less": "code",
+    "does_the_sidewalk_have_any": "code",
+    "does_the_sidewalk_have_any_1": "code",
+    "do_you_detect_any_strong": "code",
+    "does_the_route_have_one_or_1": "code",
+    "creationdate": "datetime",
+    "analysis_neighborhoods": "category",
+    "evaluation_period": "category",
+    "does_any_graffiti_include": "code",
+    "does_any_graffiti_appear": "code",
+    "what_types_of_items_are": "category",
+    "does_illegal_dumping_obstruct": "code",
+    "how_severe_are_the_pavement": "code",
+    "are_there_closed_unlabeled": "code",
+    "is_the_pile_of_item_s_more": "code",
+    "which_of_the_following_issues": "category",
+    "how_many_instances_of_broken": "count",
+    "if_yes_identify_the_cause": "category",
+    "if_yes_is_the_odor_from_a": "code",
+    "route_type": "category",
+    "cleanliness_level": "category",
+}
+
+SF_311_SCHEMA = {
+    "service_name": "category",
+    "service_subtype": "category",
+    "service_details": "category",
+    "address": "text",
+    "lat": "float",
+    "long": "float",
+    "neighborhoods_sffind_boundaries": "category",
+    "requested_datetime": "datetime",
+}
+
+
+def _convert(series, kind):
+    if kind == "text":
+        return series
+    if kind == "datetime":
+        return series if pd.api.types.is_datetime64_any_dtype(series) else pd.to_datetime(series, errors="coerce")
+
+    dtype = KIND_DTYPES[kind]
+    if series.dtype == dtype:
+        return series
+    if kind == "category":
+        return series.astype("category")
+
+    numbers = pd.to_numeric(series, errors="coerce")
+    if kind == "float":
+        return numbers.astype(dtype)
+    # Float counts (e.g. 2.0) convert cleanly; fractional junk becomes missing rather than an error
+    numbers = numbers.where(numbers.isna() | (numbers % 1 == 0))
+    return numbers.astype(dtype)
+
+def optimize_frame(df, schema, drop_unknown=True):
+    """
+    Converts `df` to the compact dtypes declared in `schema` (column -> kind).
+
+    Columns the schema doesn't list are dropped unless `drop_unknown` is False. Idempotent:
+    already-converted columns are returned as they are, so it is safe after every merge.
+    """
+    columns = [col for col in df.columns if col in schema or not drop_unknown]
+    return pd.DataFrame(
+        {col: _convert(df[col], schema[col]) if col in schema else df[col] for col in columns},
+        index=df.index,
+    )
+
+def fill_missing(series, value):
+    """`fillna` that also works on categoricals whose categories don't include `value` yet."""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+# ✅ Memory Report
+def memory_report(frames):
+    """
+    Deep memory use per dataset.
+
+    Parameters:
+        frames (dict): dataset name -> DataFrame.
+
+    Returns:
+        DataFrame: one row per dataset with rows, columns and megabytes, largest first.
+    """
+    rows = [
+        {
+            "dataset": name,
+            "rows": len(df),
+            "columns": df.shape[1],
+            "memory_mb": df.memory_usage(deep=True).sum() / 1e6,
+        }
+        for name, df in frames.items()
+    ]
+    return pd.DataFrame(rows).sort_values("memory_mb", ascending=False).reset_index(drop=True)
+
+def column_memory(df):
+    """Per-column dtype and deep memory use, largest first."""
+    usage = df.memory_usage(deep=True, index=False)
+    return (
+        pd.DataFrame({"dtype": df.dtypes.astype(str), "memory_mb": usage / 1e6})
+        .sort_values("memory_mb", ascending=False)
+    )
@@ -0,0 +1,54 @@
+import numpy as np
+from geopy.distance import geodesic
+
+EARTH_RADIUS_KM = 6371.0088  # Mean Earth radius
+# Haversine on a sphere differs from the WGS-84 geodesic by at most ~0.5%
+SPHERICAL_ERROR = 0.005
+
+
+def haversine_km(lat, lng, lats, lngs):
+    """Great-circle distance (km) from one point to arrays of points."""
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2 = np.radians(np.asarray(lats, dtype=float))
+    lng2 = np.radians(np.asarray(lngs, dtype=float))
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def equirectangular_km(lat, lng, lats, lngs):
+    """Cheaper flat-earth approximation, accurate for city-scale distances."""
+    lats = np.radians(np.asarray(lats, dtype=float))
+    lngs = np.radians(np.asarray(lngs, dtype=float))
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+
+    x = (lngs - lng1) * np.cos((lats + lat1) / 2)
+    y = lats - lat1
+    return EARTH_RADIUS_KM * np.hypot(x, y)
+
+def distances_within(lat, lng, lats, lngs, radius_km, refine=True):
+    """
+    Vectorized radius filter.
+
+    Parameters:
+        lat, lng (float): Query point.
+        lats, lngs (array-like): Candidate coordinates.
+        radius_km (float): Search radius.
+        refine (bool): Recompute exact geodesic distances only for points close
+            enough to the boundary that the spherical error could flip the result.
+
+    Returns:
+        tuple: (boolean mask of points within the radius, distance array in km).
+    """
+    distances = haversine_km(lat, lng, lats, lngs)
+    mask = distances <= radius_km
+
+    if refine:
+        margin = radius_km * SPHERICAL_ERROR
+        boundary = np.flatnonzero(np.abs(distances - radius_km) <= margin)
+        lats = np.asarray(lats, dtype=float)
+        lngs = np.asarray(lngs, dtype=float)
+        for i in boundary:
+            distances[i] = geodesic((lat, lng), (lats[i], lngs[i])).km
+            mask[i] = distances[i] <= radius_km
+
+    return mask, distances
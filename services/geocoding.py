@@ -0,0 +1,175 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config.settings as settings
+from config.settings import (
+    GEOCODE_CACHE_MAX_ENTRIES,
+    GEOCODE_CACHE_TTL,
+    GEOCODE_MAX_WORKERS,
+    GEOCODE_NEGATIVE_CACHE_TTL,
+    GEOCODE_PROVIDERS,
+    GOOGLE_GEOCODING_API_URL,
+    NOMINATIM_DOMAIN,
+    NOMINATIM_MIN_INTERVAL,
+    NOMINATIM_SCHEME,
+)
+import services.sf_gazetteer as sf_gazetteer
+from services.clients import get_http_session
+from services.result_cache import ResultCache
+
+NOT_FOUND = {}  # Cached for addresses every provider answered "no results" for
+
+geocode_cache = ResultCache(
+    "geocodes",
+    ttl_seconds=GEOCODE_CACHE_TTL,
+    max_entries=GEOCODE_CACHE_MAX_ENTRIES,
+)
+
+
+class ProviderUnavailable(Exception):
+    """The provider can't answer right now (no key, quota, outage); the miss is not cached."""
+
+
+def normalize_address(address):
+    """Cache key form of an address: case, whitespace and comma spacing don't matter."""
+    text = re.sub(r"\s+", " ", str(address).strip().lower())
+    text = re.sub(r"\s*,\s*", ", ", text)
+    return text.strip(" ,.")
+
+
+# ✅ Providers: each returns a result dict, None for "no such place", or raises ProviderUnavailable
+def _geocode_google(address):
+    api_key = settings.GOOGLE_MAPS_API_KEY  # Streamlit secrets or .env, loaded lazily
+    if not api_key:
+        raise ProviderUnavailable("missing GOOGLE_MAPS_API_KEY")
+
+    response = get_http_session().get(
+        GOOGLE_GEOCODING_API_URL, params={"address": address, "key": api_key}, timeout=10
+    )
+    if response.status_code != 200:
+        raise ProviderUnavailable(f"HTTP {response.status_code}")
+
+    data = response.json()
+    if data.get("status") == "ZERO_RESULTS":
+        return None
+    if data.get("status") != "OK" or not data.get("results"):
+        raise ProviderUnavailable(data.get("status", "unknown status"))
+
+    top = data["results"][0]
+    city, state_code = None, None
+    for component in top.get("address_components", []):
+        if "administrative_area_level_1" in component["types"]:
+            state_code = component["short_name"]  # e.g., "CA"
+        if "locality" in component["types"]:
+            city = component["long_name"]  # e.g., "San Francisco"
+
+    return {
+        "lat": top["geometry"]["location"]["lat"],
+        "lng": top["geometry"]["location"]["lng"],
+        "city": city,
+        "state_code": state_code,
+        "formatted_address": top.get("formatted_address"),
+    }
+
+_nominatim_lock = threading.Lock()
+_nominatim_last_call = [0.0]
+
+def _geocode_nominatim(address):
+    from geopy.exc import GeopyError
+    from geopy.geocoders import Nominatim
+
+    # Nominatim allows one request per second, whatever the caller's concurrency
+    with _nominatim_lock:
+        wait = _nominatim_last_call[0] + NOMINATIM_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _nominatim_last_call[0] = time.monotonic()
+
+        try:
+            location = Nominatim(user_agent="waste_management_app", domain=NOMINATIM_DOMAIN, scheme=NOMINATIM_SCHEME).geocode(address, addressdetails=True, timeout=10)
+        except GeopyError as e:
+            raise ProviderUnavailable(str(e)) from e
+
+    if location is None:
+        return None
+
+    details = location.raw.get("address", {})
+    iso_region = details.get("ISO3166-2-lvl4", "")  # e.g., "US-CA"
+    return {
+        "lat": location.latitude,
+        "lng": location.longitude,
+        "city": details.get("city") or details.get("town") or details.get("village"),
+        "state_code": iso_region.split("-", 1)[1] if "-" in iso_region else None,
+        "formatted_address": location.address,
+    }
+
+PROVIDERS = {
+    "google": _geocode_google,
+    "nominatim": _geocode_nominatim,
+}
+
+
+# ✅ Cached Lookup
+def geocode(address, providers=GEOCODE_PROVIDERS, use_gazetteer=True):
+    """
+    Resolves an address to a dict with `lat`, `lng`, `city`, `state_code`,
+    `formatted_address` and `provider`, or None if it can't be found.
+
+    SF street segments, intersections and neighborhoods are answered offline by the
+    gazetteer when `use_gazetteer` is set; only misses reach the cache and providers.
+    Providers are tried in order until one finds the address. Hits are cached for
+    GEOCODE_CACHE_TTL; addresses that every provider definitively rejected are cached
+    as misses for the shorter GEOCODE_NEGATIVE_CACHE_TTL. Provider outages are not cached.
+    """
+    if not address or not str(address).strip():
+        return None
+
+    if use_gazetteer:
+        result = sf_gazetteer.lookup(address)
+        if result is not None:
+            result["provider"] = "gazetteer"
+            return result
+
+    key = normalize_address(address)
+    cached = geocode_cache.get(key)
+    if cached is not None:
+        return cached or None  # NOT_FOUND is falsy
+
+    unavailable = False
+    for name in providers:
+        try:
+            result = PROVIDERS[name](address)
+        except ProviderUnavailable as e:
+            print(f"Geocoding provider {name} unavailable: {e}")
+            unavailable = True
+            continue
+        except Exception as e:
+            print(f"Geocoding provider {name} error: {e}")
+            unavailable = True
+            continue
+
+        if result is not None:
+            result["provider"] = name
+            geocode_cache.put(key, result)
+            return result
+
+    if not unavailable:
+        geocode_cache.put(key, NOT_FOUND, ttl_seconds=GEOCODE_NEGATIVE_CACHE_TTL)
+    return None
+
+def geocode_many(addresses, max_workers=GEOCODE_MAX_WORKERS, providers=GEOCODE_PROVIDERS, use_gazetteer=True):
+    """
+    Geocodes a batch of addresses concurrently; each distinct normalized address is
+    resolved once. Returns a dict mapping every input address to its result (or None).
+    """
+    addresses = [address for address in addresses if address and str(address).strip()]
+    by_key = {}
+    for address in addresses:
+        by_key.setdefault(normalize_address(address), address)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = dict(zip(by_key, executor.map(lambda address: geocode(address, providers, use_gazetteer), by_key.values())))
+
+    return {address: results[normalize_address(address)] for address in addresses}
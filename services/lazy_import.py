@@ -0,0 +1,40 @@
+import importlib
+import sys
+import threading
+import types
+
+# importlib's LazyLoader can hand a half-executed module to a second thread before
+# Python 3.12.3, and Streamlit runs every session in its own thread
+_load_lock = threading.RLock()
+
+
+class _LazyModule(types.ModuleType):
+    """Stand-in that imports the real module on first attribute access and delegates to it."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        with _load_lock:
+            if self.__dict__["_module"] is None:
+                self.__dict__["_module"] = importlib.import_module(self.__name__)
+        return self.__dict__["_module"]
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name):
+    """
+    Returns module `name` without executing it yet.
+
+    The module body runs on first attribute access, so importing app.py stays cheap
+    and each service pays its import cost only when a section actually uses it.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return _LazyModule(name)
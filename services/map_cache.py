@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import folium
+from config.settings import MAP_CACHE_DIR, MAP_CACHE_DISK_ENTRIES, MAP_CACHE_MEMORY_ENTRIES
+from services.map_rendering import MARKER_CLUSTER_THRESHOLD
+
+# Bump when map styling changes so previously rendered HTML is not served
+MAP_CACHE_VERSION = 1
+
+
+def map_key(*parts):
+    """Content hash of a map's inputs; equal inputs always produce the same key."""
+    payload = json.dumps(
+        [MAP_CACHE_VERSION, folium.__version__, MARKER_CLUSTER_THRESHOLD, parts],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def render_html(m):
+    """Serializes a folium map to the standalone HTML document `folium_static` would embed."""
+    return folium.Figure().add_child(m).render()
+
+
+class MapCache:
+    """
+    Rendered map HTML, keyed by `map_key`, in a small in-process LRU backed by a disk LRU.
+
+    Memory hits skip both building and serializing the map. Disk entries survive restarts
+    and are shared by every process on the host; file mtimes track recency for eviction.
+    """
+
+    def __init__(self, directory=MAP_CACHE_DIR, memory_entries=MAP_CACHE_MEMORY_ENTRIES, disk_entries=MAP_CACHE_DISK_ENTRIES):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.html")
+
+    def get(self, key):
+        """Returns the cached HTML, or None on a miss."""
+        with self._lock:
+            html = self._memory.get(key)
+            if html is not None:
+                self._memory.move_to_end(key)
+                return html
+
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                html = f.read()
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            return None
+
+        self._remember(key, html)
+        return html
+
+    def put(self, key, html):
+        self._remember(key, html)
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(html)
+        os.replace(tmp_path, self._path(key))  # Readers never see a partial file
+        self._evict_disk()
+
+    def get_or_build(self, key, build):
+        """Returns the HTML for `key`, calling `build()` for a folium map only on a miss."""
+        html = self.get(key)
+        if html is None:
+            html = render_html(build())
+            self.put(key, html)
+        return html
+
+    def _remember(self, key, html):
+        with self._lock:
+            self._memory[key] = html
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".html")]
+        except OSError:
+            return
+        if len(entries) <= self.disk_entries:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self.disk_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass  # Already evicted by another process
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".html"):
+                    os.remove(entry.path)
+
+
+map_cache = MapCache()
+
+
+def get_map_html(key_parts, build):
+    """Shortcut for `map_cache.get_or_build(map_key(*key_parts), build)`."""
+    return map_cache.get_or_build(map_key(*key_parts), build)
+
+def prebuild_static_maps():
+    """Renders the maps whose inputs never change at runtime, so the first view is a cache hit."""
+    from services import sf_center
+
+    sf_center.get_sf_map_html()
+
+
+if __name__ == "__main__":
+    # Build step: python -m services.map_cache
+    prebuild_static_maps()
+    print(f"Prebuilt static maps in {MAP_CACHE_DIR}")
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+import aiohttp
+import pandas as pd
+from config.settings import (
+    PREFETCH_MAX_CONCURRENCY,
+    PREFETCH_TIMEOUT,
+    SF_311_API_URL,
+    SF_311_SERVER_AGGREGATION,
+    SF_PIT_STOP_API_URL,
+)
+import services.datasf_analytics_services as analytics
+import services.sf_311_data as sf_311
+import services.sf_data_services  # Registers the pit_stops dataset with the scheduler
+from services.geocoding import geocode
+from services.refresh_scheduler import scheduler
+from services.spatial_index import stamp_version
+
+# One event loop thread per process runs every prefetch; Streamlit script threads only wait on results
+_loop = None
+_loop_lock = threading.Lock()
+
+# Created on the loop thread, on first use
+_session = None
+_semaphore = None
+
+
+def _event_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="prefetch-loop", daemon=True).start()
+    return _loop
+
+async def _shared():
+    """The pooled aiohttp session and the global cap on requests in flight."""
+    global _session, _semaphore
+    if _session is None or _session.closed:
+        _semaphore = asyncio.Semaphore(PREFETCH_MAX_CONCURRENCY)
+        _session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=PREFETCH_TIMEOUT))
+    return _session, _semaphore
+
+async def _get_json(url, params=None):
+    session, semaphore = await _shared()
+    async with semaphore:
+        async with session.get(url, params=params) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+async def _in_thread(func, *args):
+    """Runs blocking work (Parquet I/O, geocoder) without stalling the other fetches."""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+# ✅ Dataset Fetches (each warms the refresh scheduler, which sections then read from)
+async def _street_data():
+    """Due street sync through the scheduler, under the same lock as its background syncs."""
+    await _in_thread(analytics.schedule_street_sync, True)
+
+async def _sf_311_counts():
+    if not SF_311_SERVER_AGGREGATION or scheduler.has_value("sf_311_counts"):
+        return
+    records = await _get_json(SF_311_API_URL, sf_311.complaint_counts_query())
+    scheduler.seed("sf_311_counts", sf_311.counts_from_records(records))
+
+async def _pit_stops():
+    if scheduler.has_value("pit_stops"):
+        return
+    scheduler.seed("pit_stops", stamp_version(pd.DataFrame(await _get_json(SF_PIT_STOP_API_URL))))
+
+async def _geocode(location):
+    await _in_thread(geocode, location)
+
+
+def start_prefetch(default_location=None):
+    """
+    Starts every independent upstream fetch concurrently and returns immediately.
+
+    Results land in the refresh scheduler (and the geocode cache), so sections keep
+    reading refreshed data through the usual loaders.
+
+    Returns:
+        dict: dataset name -> `concurrent.futures.Future`. Sections `wait()` on the ones
+        they need before loading, so a cold start costs about the slowest upstream
+        rather than the sum of all of them, and nothing is fetched twice.
+    """
+    jobs = {
+        "street_data": _street_data(),
+        "sf_311_counts": _sf_311_counts(),
+        "pit_stops": _pit_stops(),
+    }
+    if default_location:
+        jobs["default_location"] = _geocode(default_location)
+
+    loop = _event_loop()
+    return {name: asyncio.run_coroutine_threadsafe(job, loop) for name, job in jobs.items()}
+
+def wait(futures, name, timeout=PREFETCH_TIMEOUT):
+    """Waits for prefetch `name` to finish; a failure is only logged, since callers then load it themselves."""
+    future = futures.get(name)
+    if future is None:
+        return
+    try:
+        future.result(timeout=timeout)
+    except Exception as e:
+        print(f"Prefetch of {name} failed: {e}")
@@ -1,12 +1,10 @@
-import googlemaps
-from config.settings import GOOGLE_MAPS_API_KEY
-import requests
-from config.settings import IWASTE_API_URL
+from config.settings import IWASTE_API_URL, GOOGLE_MAPS_API_URL
 import streamlit as st 
 import os
 import pandas as pd
-import openai
-from geopy.distance import geodesic
+from services.clients import get_http_session, get_openai_client
+from services.spatial_index import get_spatial_index
+from services.sf_311_data import get_sf_311_data  # Shared, cached SF 311 loader
 
 def get_disposal_facilities(state_code, facility_type_id):
     """Fetches the nearest disposal facilities based on state and selected type."""
@@ -15,7 +13,7 @@ def get_disposal_facilities(state_code, facility_type_id):
 
     url = f"{IWASTE_API_URL}/facilities?stateCode={state_code}&facilityTypeId={facility_type_id}"
 
-    response = requests.get(url)
+    response = get_http_session().get(url)
     #st.write(f"API Request: {url}")  # Debugging
     #st.write(f"API Status Code: {response.status_code}")  # Debugging
 
@@ -34,7 +32,7 @@ GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 def get_nearby_disposal_sites(lat, lng, radius_km):
     """Fetch nearby waste disposal sites using Google Maps API."""
     
-    url = f"https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+    url = GOOGLE_MAPS_API_URL
     params = {
         "location": f"{lat},{lng}",
         "radius": radius_km * 1000,  # Convert to meters
@@ -42,7 +40,7 @@ def get_nearby_disposal_sites(lat, lng, radius_km):
         "key": GOOGLE_MAPS_API_KEY
     }
 
-    response = requests.get(url, params=params)
+    response = get_http_session().get(url, params=params)
     results = response.json().get("results", [])
 
     data = []
@@ -58,35 +56,6 @@ def get_nearby_disposal_sites(lat, lng, radius_km):
 
 
 
-SF_311_API_URL = "https://data.sfgov.org/resource/vw6y-z8j6.json"
-
-def get_sf_311_data():
-    """Fetch SF 311 waste complaints and return as a DataFrame."""
-    response = requests.get(SF_311_API_URL)
-    
-    if response.status_code == 200:
-        data = response.json()
-        df = pd.DataFrame(data)
-
-        # ✅ Ensure required columns exist
-        required_cols = ["service_subtype", "service_details", "address", "lat", "long"]
-        for col in required_cols:
-            if col not in df.columns:
-                df[col] = None  # Add missing columns if they don't exist
-
-        df.dropna(subset=["lat", "long", "address"], inplace=True)
-
-        # ✅ Convert lat/long to float
-        df["lat"] = df["lat"].astype(float)
-        df["long"] = df["long"].astype(float)
-
-        # ✅ Fill missing service details
-        df["service_details"] = df["service_details"].fillna("General Waste")
-
-        return df
-    else:
-        return pd.DataFrame()
-
 def get_ai_suggested_disposal_sites(user_lat, user_lng, radius_km):
     """Use AI to suggest waste disposal sites based on SF 311 trends."""
     
@@ -104,11 +73,7 @@ def get_ai_suggested_disposal_sites(user_lat, user_lng, radius_km):
     }).reset_index()
 
     # ✅ Filter by distance
-    disposal_sites["distance_km"] = disposal_sites.apply(
-        lambda row: geodesic((user_lat, user_lng), (row["lat"], row["long"])).km, axis=1
-    )
-    
-    disposal_sites = disposal_sites[disposal_sites["distance_km"] <= radius_km]
+    disposal_sites = get_spatial_index("sf_311_disposal_sites", disposal_sites, "lat", "long").within(user_lat, user_lng, radius_km)
 
     # ✅ Generate AI-powered recommendations
     recommendations = generate_ai_recommendation(disposal_sites)
@@ -142,7 +107,7 @@ def generate_ai_recommendation(disposal_sites):
     """
 
     try:
-        client = openai.OpenAI()
+        client = get_openai_client()
         response = client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": prompt}]
@@ -153,11 +118,6 @@ def generate_ai_recommendation(disposal_sites):
     except Exception as e:
         return f"⚠️ AI recommendation error: {str(e)}"
 
-import folium
-
-# Create a map centered on San Francisco
-sf_map = folium.Map(location=[37.7749, -122.4194], zoom_start=12)
-
 # List of waste disposal locations in San Francisco
 locations = [
     {"name": "Recology San Francisco Transfer Station", "lat": 37.7403, "lon": -122.3963},
@@ -170,16 +130,26 @@ locations = [
     {"name": "South San Francisco Scavenger Company", "lat": 37.6531, "lon": -122.4075},
 ]
 
-# Add markers to the map
-for location in locations:
-    folium.Marker(
-        [location["lat"], location["lon"]],
-        popup=location["name"],
-        tooltip=location["name"],
-        icon=folium.Icon(color="green", icon="trash"),
-    ).add_to(sf_map)
+def save_sf_waste_map(path="san_francisco_waste_map.html"):
+    """Builds the SF disposal-site map and saves it as a standalone HTML file."""
+    import folium
+
+    # Create a map centered on San Francisco
+    sf_map = folium.Map(location=[37.7749, -122.4194], zoom_start=12)
+
+    # Add markers to the map
+    for location in locations:
+        folium.Marker(
+            [location["lat"], location["lon"]],
+            popup=location["name"],
+            tooltip=location["name"],
+            icon=folium.Icon(color="green", icon="trash"),
+        ).add_to(sf_map)
+
+    # Save the map to an HTML file
+    sf_map.save(path)
+    return path
 
-# Save the map to an HTML file
-sf_map.save("san_francisco_waste_map.html")
 
-print("Map saved as 'san_francisco_waste_map.html'. Open this file in a browser to view it.")
+if __name__ == "__main__":
+    print(f"Map saved as '{save_sf_waste_map()}'. Open this file in a browser to view it.")
@@ -0,0 +1,244 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import (
+    REFRESH_AHEAD_FRACTION,
+    REFRESH_CHECK_SECONDS,
+    REFRESH_IDLE_EXPIRY,
+    REFRESH_RETRY_SECONDS,
+    SNAPSHOT_DIR,
+)
+
+
+class _Entry:
+    """One dataset value (per argument tuple) and its refresh bookkeeping."""
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.value = None
+        self.has_value = False
+        self.refreshed_at = None
+        self.last_read = time.time()
+        self.last_error = None
+        self.last_error_at = None
+        self.refreshing = False
+        self.load_lock = threading.Lock()  # One load at a time per entry
+
+
+class RefreshScheduler:
+    """
+    Stale-while-revalidate cache for upstream datasets.
+
+    `get()` returns the last known good value immediately. A background thread reloads
+    each value once it is REFRESH_AHEAD_FRACTION of the way through its interval, so
+    readers never wait on an expiry; a failed reload keeps serving the old value and
+    records the error. Values are snapshotted to disk, so a freshly started process
+    serves the previous copy instead of blocking on the first fetch.
+    """
+
+    def __init__(self, snapshot_dir=SNAPSHOT_DIR, max_workers=4):
+        self.snapshot_dir = snapshot_dir
+        self._datasets = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dataset-refresh")
+        self._thread = None
+
+    def register(self, name, loader, interval, snapshot=True):
+        """`loader(*args)` fetches a fresh value and raises on failure; it's called every `interval` seconds."""
+        self._datasets[name] = {"loader": loader, "interval": interval, "snapshot": snapshot}
+
+    # ✅ Reads
+    def get(self, name, *args, default=None, wait=True):
+        """
+        Returns the current value of dataset `name` for `args`.
+
+        Only the very first load of a value blocks (when there is no snapshot either);
+        with `wait=False` it runs in the background and `default` is returned meanwhile.
+        If that first load fails, `default` is returned and the error is in `status()`.
+        """
+        self._check_registered(name)
+        entry = self._entry(name, args)
+        entry.last_read = time.time()
+        self._ensure_thread()
+
+        if entry.has_value:
+            if self._due(entry):
+                self._submit(entry)
+            return entry.value
+
+        if not wait:
+            self._submit(entry)
+            return default
+
+        with entry.load_lock:
+            if not entry.has_value:
+                self._load(entry)
+        return entry.value if entry.has_value else default
+
+    def seed(self, name, value, *args, refreshed_at=None):
+        """
+        Stores a value fetched elsewhere (e.g. by the async prefetch) unless one is already held.
+        `refreshed_at` backdates it, so its refresh comes due at the right time.
+        """
+        self._check_registered(name)
+        entry = self._entry(name, args)
+        with entry.load_lock:
+            if not entry.has_value:
+                self._store(entry, value)
+                if refreshed_at is not None:
+                    entry.refreshed_at = refreshed_at
+
+    def has_value(self, name, *args):
+        """True once a value (fetched, seeded or restored from a snapshot) is held; never triggers a load."""
+        if name not in self._datasets:
+            return False
+        return self._entry(name, args).has_value
+
+    def last_error(self, name, *args):
+        entry = self._entries.get((name, args))
+        return entry.last_error if entry else None
+
+    def status(self):
+        """Freshness of every loaded value: age, interval, whether a refresh is running, last error."""
+        now = time.time()
+        rows = []
+        for entry in list(self._entries.values()):
+            if entry.name not in self._datasets:
+                continue
+            interval = self._datasets[entry.name]["interval"]
+            age = now - entry.refreshed_at if entry.refreshed_at else None
+            rows.append({
+                "dataset": entry.name,
+                "key": ", ".join(map(str, entry.args)),
+                "interval_seconds": interval,
+                "age_seconds": round(age) if age is not None else None,
+                "fresh": age is not None and age < interval,
+                "refreshing": entry.refreshing,
+                "last_error": entry.last_error,
+            })
+        return rows
+
+    # ✅ Loading
+    def _check_registered(self, name):
+        """Raises before any entry is created, so a missing `register()` can't leave a half-stored value."""
+        if name not in self._datasets:
+            raise KeyError(f"Dataset {name!r} is not registered with the refresh scheduler")
+
+    def _entry(self, name, args):
+        key = (name, args)
+        entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = _Entry(name, args)
+                    self._restore(entry)
+                    self._entries[key] = entry
+        return entry
+
+    def _due(self, entry):
+        if entry.name not in self._datasets:
+            return False
+        interval = self._datasets[entry.name]["interval"]
+        if entry.refreshing or entry.refreshed_at is None:
+            return False
+        if entry.last_error_at and time.time() - entry.last_error_at < REFRESH_RETRY_SECONDS:
+            return False
+        return time.time() - entry.refreshed_at >= interval * REFRESH_AHEAD_FRACTION
+
+    def _submit(self, entry):
+        with self._lock:
+            if entry.refreshing:
+                return
+            entry.refreshing = True
+        self._executor.submit(self._background_load, entry)
+
+    def _background_load(self, entry):
+        with entry.load_lock:
+            self._load(entry)
+        entry.refreshing = False
+
+    def _load(self, entry):
+        try:
+            value = self._datasets[entry.name]["loader"](*entry.args)
+        except Exception as e:
+            entry.last_error = f"{type(e).__name__}: {e}"
+            entry.last_error_at = time.time()
+            print(f"Refresh of {entry.name}{list(entry.args) or ''} failed: {e}")
+            return
+        self._store(entry, value)
+
+    def _store(self, entry, value):
+        entry.value = value
+        entry.has_value = True
+        entry.refreshed_at = time.time()
+        entry.last_error = None
+        entry.last_error_at = None
+        if self._datasets[entry.name]["snapshot"]:
+            self._write_snapshot(entry)
+
+    # ✅ Background Thread
+    def _ensure_thread(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="dataset-refresh-scheduler", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(REFRESH_CHECK_SECONDS)
+            try:
+                self._check_all()
+            except Exception as e:
+                print(f"Refresh check failed: {e}")  # Keep the thread alive for every other dataset
+
+    def _check_all(self):
+        now = time.time()
+        for key, entry in list(self._entries.items()):
+            if entry.args and now - entry.last_read > REFRESH_IDLE_EXPIRY:
+                with self._lock:
+                    self._entries.pop(key, None)  # Nobody asks for this key any more
+            elif entry.has_value and self._due(entry):
+                self._submit(entry)
+
+    # ✅ Disk Snapshots
+    def _snapshot_path(self, entry):
+        if not entry.args:
+            return os.path.join(self.snapshot_dir, f"{entry.name}.pkl")
+        digest = hashlib.sha1(repr(entry.args).encode()).hexdigest()[:16]
+        return os.path.join(self.snapshot_dir, f"{entry.name}-{digest}.pkl")
+
+    def _write_snapshot(self, entry):
+        path = self._snapshot_path(entry)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"args": entry.args, "value": entry.value, "refreshed_at": entry.refreshed_at}, f)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"Snapshot of {entry.name} not written: {e}")
+
+    def _restore(self, entry):
+        if not self._datasets.get(entry.name, {}).get("snapshot"):
+            return
+        try:
+            with open(self._snapshot_path(entry), "rb") as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        if snapshot.get("args") == entry.args:
+            entry.value = snapshot["value"]
+            entry.has_value = True
+            entry.refreshed_at = snapshot["refreshed_at"]  # Age carries over, so stale snapshots refresh at once
+
+
+# Process-wide: every Streamlit session reads the same values
+scheduler = RefreshScheduler()
@@ -0,0 +1,109 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config.settings import RESULT_CACHE_PATH
+
+
+class ResultCache:
+    """
+    Persistent key/value cache backed by SQLite, shared across sessions and processes.
+
+    Values are stored as JSON. Entries expire after their TTL, and once the table grows
+    past `max_entries` the least recently used entries are evicted.
+    """
+
+    def __init__(self, name, ttl_seconds, max_entries, path=RESULT_CACHE_PATH):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+        self._local = threading.local()  # One connection per thread
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.name} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL, fingerprint INTEGER)"
+            )
+            # Tables created before fingerprints existed
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({self.name})")}
+            if "fingerprint" not in columns:
+                conn.execute(f"ALTER TABLE {self.name} ADD COLUMN fingerprint INTEGER")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.name}_accessed ON {self.name} (accessed_at)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """Returns the cached value, or None on a miss or an expired entry."""
+        conn = self._connection()
+        row = conn.execute(f"SELECT value, expires_at FROM {self.name} WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if row[1] < now:
+            conn.execute(f"DELETE FROM {self.name} WHERE key = ?", (key,))
+            return None
+
+        conn.execute(f"UPDATE {self.name} SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, key, value, ttl_seconds=None, fingerprint=None):
+        """
+        Stores a value; `ttl_seconds` overrides the cache-wide TTL for this entry.
+
+        `fingerprint` is an optional 64-bit similarity hash used by `find_similar`.
+        """
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if fingerprint is not None and fingerprint >= 1 << 63:
+            fingerprint -= 1 << 64  # SQLite integers are signed 64-bit
+        conn = self._connection()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.name} (key, value, expires_at, accessed_at, fingerprint) VALUES (?, ?, ?, ?, ?)",
+            (key, json.dumps(value), now + ttl, now, fingerprint),
+        )
+        self._evict(conn)
+
+    def find_similar(self, fingerprint, max_distance):
+        """Returns the value whose fingerprint is closest in Hamming distance, if within `max_distance`."""
+        conn = self._connection()
+        rows = conn.execute(
+            f"SELECT key, fingerprint FROM {self.name} WHERE fingerprint IS NOT NULL AND expires_at >= ?",
+            (time.time(),),
+        ).fetchall()
+
+        best_key, best_distance = None, max_distance + 1
+        for key, stored in rows:
+            distance = ((stored ^ fingerprint) & 0xFFFFFFFFFFFFFFFF).bit_count()
+            if distance < best_distance:
+                best_key, best_distance = key, distance
+
+        return self.get(best_key) if best_key is not None else None
+
+    def _evict(self, conn):
+        (count,) = conn.execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                f"DELETE FROM {self.name} WHERE key IN "
+                f"(SELECT key FROM {self.name} ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def delete(self, key):
+        self._connection().execute(f"DELETE FROM {self.name} WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connection().execute(f"DELETE FROM {self.name}")
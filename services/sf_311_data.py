@@ -0,0 +1,97 @@
+import pandas as pd
+from config.settings import SF_311_API_URL, SF_311_WASTE_SERVICE_NAMES, SF_311_ROW_LIMIT, SF_311_CACHE_TTL
+from services.clients import get_http_session
+from services.frame_schema import SF_311_SCHEMA, optimize_frame
+from services.refresh_scheduler import scheduler
+from services.spatial_index import stamp_version
+
+# Only the columns any caller reads are requested from Socrata
+SF_311_COLUMNS = [
+    "service_name", "service_subtype", "service_details", "address",
+    "lat", "long", "neighborhoods_sffind_boundaries", "requested_datetime",
+]
+
+
+def waste_filter():
+    """SoQL `$where` restricting cases to waste-related service types with coordinates."""
+    names = ", ".join("'{}'".format(name.replace("'", "''")) for name in SF_311_WASTE_SERVICE_NAMES)
+    return f"service_name in ({names}) AND lat IS NOT NULL AND long IS NOT NULL"
+
+def build_query(columns=SF_311_COLUMNS, limit=SF_311_ROW_LIMIT):
+    """Socrata parameters that push column and row filtering to the server."""
+    return {
+        "$select": ", ".join(columns),
+        "$where": waste_filter(),
+        "$order": "requested_datetime DESC",
+        "$limit": limit,
+    }
+
+def to_frame(records):
+    """Shared cleaning rules for SF 311 rows."""
+    df = pd.DataFrame(records, columns=SF_311_COLUMNS)
+
+    # ✅ Convert lat/long to float, dropping rows without usable coordinates
+    df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
+    df["long"] = pd.to_numeric(df["long"], errors="coerce")
+    df = df.dropna(subset=["lat", "long"]).reset_index(drop=True)
+
+    # ✅ Fill missing service details
+    df["service_details"] = df["service_details"].fillna("General Waste")
+    return optimize_frame(df, SF_311_SCHEMA)
+
+def _load_sf_311_data():
+    response = get_http_session().get(SF_311_API_URL, params=build_query(), timeout=60)
+    response.raise_for_status()
+    return stamp_version(to_frame(response.json()))
+
+scheduler.register("sf_311_rows", _load_sf_311_data, interval=SF_311_CACHE_TTL)
+
+def get_sf_311_data():
+    """Fetch SF 311 waste complaints and return as a DataFrame (shared, refreshed in the background)."""
+    df = scheduler.get("sf_311_rows")
+    return df.copy() if df is not None else pd.DataFrame()
+
+# ✅ Server-side aggregation: counts per neighborhood and subtype instead of raw rows
+AGGREGATE_QUERY = {
+    "$select": (
+        "neighborhoods_sffind_boundaries, service_subtype, "
+        "count(address) AS total_reports, count(*) AS subtype_reports, count(lat) AS located_reports, "
+        "avg(lat) AS lat, avg(long) AS long"
+    ),
+    "$group": "neighborhoods_sffind_boundaries, service_subtype",
+    "$limit": 50000,  # A few hundred groups in practice
+}
+
+def complaint_counts_query():
+    return {**AGGREGATE_QUERY, "$where": waste_filter() + " AND neighborhoods_sffind_boundaries IS NOT NULL"}
+
+def _load_complaint_counts():
+    response = get_http_session().get(SF_311_API_URL, params=complaint_counts_query(), timeout=60)
+    response.raise_for_status()
+    try:
+        records = response.json()
+    except ValueError:
+        return None
+    return counts_from_records(records)
+
+scheduler.register("sf_311_counts", _load_complaint_counts, interval=SF_311_CACHE_TTL)
+
+def get_complaint_counts():
+    """
+    Complaint counts (and mean coordinates) per neighborhood and subtype, computed by Socrata.
+
+    Returns:
+        DataFrame or None: None when the server can't aggregate (e.g. a local stand-in)
+        or the first fetch failed, so callers can fall back to the raw-row path.
+    """
+    return scheduler.get("sf_311_counts")
+
+def counts_from_records(records):
+    """Typed counts frame from the aggregate query's JSON, or None if the server didn't group."""
+    df = pd.DataFrame(records)
+    if "total_reports" not in df.columns:
+        return None  # Server ignored $group and returned raw rows
+
+    for col in ["total_reports", "subtype_reports", "located_reports", "lat", "long"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
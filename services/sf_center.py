@@ -1,4 +1,7 @@
 import folium
+from services.map_cache import get_map_html
+from services.map_rendering import add_points
+from services.spatial_index import get_records_index
 
 def get_waste_disposal_locations():
     """Returns a list of waste disposal locations in San Francisco."""
@@ -83,6 +86,16 @@ def get_waste_disposal_locations():
     }
 ]
 
+def get_nearest_disposal_locations(lat, lng, k=3):
+    """Returns the `k` disposal locations closest to a point, nearest first."""
+    index = get_records_index("sf_disposal_locations", get_waste_disposal_locations())
+    return index.nearest(lat, lng, k).to_dict("records")
+
+def get_disposal_locations_within(lat, lng, radius_km):
+    """Returns the disposal locations within `radius_km` of a point, nearest first."""
+    index = get_records_index("sf_disposal_locations", get_waste_disposal_locations())
+    return index.within(lat, lng, radius_km).to_dict("records")
+
 def create_sf_map():
     """Creates and returns a Folium map of San Francisco waste disposal locations."""
     
@@ -93,12 +106,18 @@ def create_sf_map():
     locations = get_waste_disposal_locations()
 
     # Add waste disposal locations as markers
-    for location in locations:
-        folium.Marker(
-            [location["lat"], location["lon"]],
-            popup=f"<b>{location['name']}</b><br>{location['address']}",
-            tooltip=location["name"],
-            icon=folium.Icon(color="green", icon="trash"),
-        ).add_to(sf_map)
+    add_points(
+        sf_map,
+        [location["lat"] for location in locations],
+        [location["lon"] for location in locations],
+        popups=[f"<b>{location['name']}</b><br>{location['address']}" for location in locations],
+        tooltips=[location["name"] for location in locations],
+        color="green",
+        icon="trash",
+    )
 
     return sf_map
+
+def get_sf_map_html():
+    """Rendered HTML of `create_sf_map()`, built once and then served from the map cache."""
+    return get_map_html(("sf_disposal_map", get_waste_disposal_locations()), create_sf_map)
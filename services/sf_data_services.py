@@ -1,21 +1,21 @@
-import requests
 import pandas as pd
-import streamlit as st
-import os
-from geopy.distance import geodesic
+from config.settings import PIT_STOP_REFRESH_INTERVAL, SF_PIT_STOP_API_URL
+from services.spatial_index import get_spatial_index, stamp_version
+from services.clients import get_http_session
+from services.geocoding import geocode
+from services.refresh_scheduler import scheduler
 
-# ✅ Load API Keys Securely
-GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")  # Fetch from environment variables
-SF_PIT_STOP_API_URL = "https://data.sfgov.org/resource/mr6h-cr3u.json"
-GOOGLE_GEOCODING_API_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+def _load_pit_stop_data():
+    response = get_http_session().get(SF_PIT_STOP_API_URL, timeout=60)
+    response.raise_for_status()
+    return stamp_version(pd.DataFrame(response.json()))
+
+scheduler.register("pit_stops", _load_pit_stop_data, interval=PIT_STOP_REFRESH_INTERVAL)
 
-@st.cache_data
 def fetch_pit_stop_data():
-    """Fetch public restroom (Pit Stop) data from San Francisco API."""
-    response = requests.get(SF_PIT_STOP_API_URL)
-    if response.status_code == 200:
-        return pd.DataFrame(response.json())
-    return pd.DataFrame()
+    """Fetch public restroom (Pit Stop) data from San Francisco API (refreshed in the background)."""
+    df = scheduler.get("pit_stops")
+    return df.copy() if df is not None else pd.DataFrame()  # Callers add columns; keep the shared copy intact
 
 def process_pit_stop_data(df):
     """Process the fetched data for analysis & visualization."""
@@ -33,37 +33,23 @@ def get_cleaned_pit_stop_data():
     return process_pit_stop_data(df)
 
 def get_coordinates(address):
-    """Convert user’s address to latitude & longitude using Google Geocoding API."""
-    if not GOOGLE_MAPS_API_KEY:
-        st.error("⚠️ Missing Google Maps API Key.")
+    """Convert user’s address to latitude & longitude (cached geocoder)."""
+    result = geocode(address)
+    if result is None:
         return None, None
 
-    params = {"address": address, "key": GOOGLE_MAPS_API_KEY}
-    response = requests.get(GOOGLE_GEOCODING_API_URL, params=params)
-
-    if response.status_code == 200:
-        data = response.json()
-        if data["results"]:
-            location = data["results"][0]["geometry"]["location"]
-            lat, lng = location["lat"], location["lng"]
-            print(f"📍 Geocoding Debug: {address} -> {lat}, {lng}")  # Debugging
-            return lat, lng
-
-    return None, None
+    return result["lat"], result["lng"]
 
 def filter_nearby_pit_stops(user_lat, user_lng, df, max_distance_km=5):
-    """Find Pit Stops within a given radius of the user's location."""
-    nearby_stops = []
-    
-    for _, row in df.iterrows():
-        pit_stop_location = (row["latitude"], row["longitude"])
-        user_location = (user_lat, user_lng)
-        distance = geodesic(user_location, pit_stop_location).km
-
-        print(f"🚀 Checking Pit Stop: {row['name']} -> Distance: {distance:.2f} km")  # Debugging
+    """Find Pit Stops within a given radius of the user's location, nearest first."""
+    if df is None or df.empty:
+        return pd.DataFrame()
 
-        if distance <= max_distance_km:
-            nearby_stops.append(row)
+    return get_spatial_index("pit_stops", df).within(user_lat, user_lng, max_distance_km)
 
-    return pd.DataFrame(nearby_stops)
+def find_nearest_pit_stops(user_lat, user_lng, df, k=5):
+    """Find the `k` Pit Stops closest to the user's location."""
+    if df is None or df.empty:
+        return pd.DataFrame()
 
+    return get_spatial_index("pit_stops", df).nearest(user_lat, user_lng, k)
@@ -0,0 +1,232 @@
+import difflib
+import json
+import os
+import re
+import string
+import threading
+
+import pandas as pd
+
+GAZETTEER_FILE = "sf_gazetteer.json"
+FUZZY_CUTOFF = 0.85  # difflib similarity a street or neighborhood name must reach
+
+# Geocoded intersections outside this box are geocoder fallbacks (city centroid, wrong city)
+SF_BOUNDS = {"lat": (37.63, 37.84), "lng": (-122.53, -122.35)}
+
+STREET_SUFFIXES = {
+    "STREET": "ST", "AVENUE": "AVE", "BOULEVARD": "BLVD", "DRIVE": "DR", "ROAD": "RD",
+    "PLACE": "PL", "TERRACE": "TER", "COURT": "CT", "LANE": "LN", "HIGHWAY": "HWY",
+    "ALLEY": "ALY", "PLAZA": "PLZ", "CIRCLE": "CIR",
+}
+
+_BETWEEN = re.compile(r"^(.+?)\s+BETWEEN\s+(.+?)\s+AND\s+(.+)$")
+_INTERSECTION = re.compile(r"\s*(?:&|@|/)\s*|\s+(?:AND|AT)\s+")
+_SF_SUFFIX = re.compile(r"(?:,\s*|\s+)(?:SAN FRANCISCO|SF)\b.*$")
+
+
+# ✅ Name Normalization
+def normalize_street(name):
+    """Canonical street name: upper case, abbreviated suffix, no leading zeros ("6th Avenue" -> "6TH AVE")."""
+    words = re.sub(r"[.,]", " ", str(name).upper()).split()
+    words = [STREET_SUFFIXES.get(word, word) for word in words]
+    return re.sub(r"\b0+(\d)", r"\1", " ".join(words))
+
+def intersection_key(street_a, street_b):
+    """Order-independent key for the crossing of two (normalized) streets."""
+    return " & ".join(sorted((street_a, street_b)))
+
+def parse_route_location(route_location):
+    """Splits "X BETWEEN A AND B" into normalized (street, from_street, to_street), or None."""
+    match = _BETWEEN.match(str(route_location).upper().strip())
+    if not match:
+        return None
+    return tuple(normalize_street(part) for part in match.groups())
+
+def neighborhood_aliases(neighborhood):
+    """Names a user might type for an analysis neighborhood such as "15 - Russian Hill, Nob Hill"."""
+    label = re.sub(r"^\d+\s*-\s*", "", neighborhood)
+    parts = [part.strip().upper() for part in re.split(r"[,/]", label) if part.strip()]
+    return {label.upper(), *parts}
+
+
+# ✅ Build & Persist
+def _in_sf(lat, lng):
+    return SF_BOUNDS["lat"][0] <= lat <= SF_BOUNDS["lat"][1] and SF_BOUNDS["lng"][0] <= lng <= SF_BOUNDS["lng"][1]
+
+def _centroid(points):
+    points = [point for point in points if point is not None]
+    if not points:
+        return None
+    return [sum(p[0] for p in points) / len(points), sum(p[1] for p in points) / len(points)]
+
+def build_gazetteer(df, path=GAZETTEER_FILE):
+    """
+    Builds (or extends) the gazetteer from street maintenance rows with `route_location`
+    and `analysis_neighborhoods`.
+
+    Each distinct intersection is geocoded once through the online chain and kept on disk,
+    so rebuilding after a sync only geocodes intersections that weren't seen before.
+    Segment coordinates are the midpoint of their two end intersections, and neighborhood
+    coordinates are the centroid of their segments.
+    """
+    from services.geocoding import geocode_many
+
+    existing = load_gazetteer(path)
+    intersections = dict(existing["intersections"])
+
+    routes = df[["route_location", "analysis_neighborhoods"]].dropna().drop_duplicates()
+    parsed = [(parse_route_location(route), hood) for route, hood in routes.itertuples(index=False)]
+    parsed = [(segment, hood) for segment, hood in parsed if segment is not None]
+
+    wanted = {intersection_key(street, cross) for (street, a, b), _ in parsed for cross in (a, b)}
+    missing = sorted(wanted - intersections.keys())
+    queries = {key: f"{key.replace(' & ', ' and ')}, San Francisco, CA" for key in missing}
+    results = geocode_many(queries.values(), providers=("google", "nominatim"), use_gazetteer=False)
+    for key, query in queries.items():
+        result = results.get(query)
+        if result and _in_sf(result["lat"], result["lng"]):
+            intersections[key] = [result["lat"], result["lng"]]
+
+    segments, members = {}, {}
+    for (street, a, b), hood in parsed:
+        point = _centroid([intersections.get(intersection_key(street, a)), intersections.get(intersection_key(street, b))])
+        if point is None:
+            continue
+        segments[f"{street} BETWEEN {a} AND {b}"] = point
+        members.setdefault(hood, []).append(point)
+
+    gazetteer = {
+        "intersections": intersections,
+        "segments": {**existing["segments"], **segments},
+        "neighborhoods": {**existing["neighborhoods"], **{hood: _centroid(points) for hood, points in members.items()}},
+    }
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(gazetteer, f)
+    os.replace(tmp_path, path)
+
+    with _tables_lock:
+        _tables_by_path.pop(path, None)  # Next lookup reads the new tables
+    return gazetteer
+
+
+class _Gazetteer:
+    """In-memory lookup tables derived from the persisted gazetteer."""
+
+    def __init__(self, data):
+        self.data = data
+        self.intersections = data["intersections"]
+        self.segments = data["segments"]
+        self._street_set = {street for key in self.intersections for street in key.split(" & ")}
+        self.streets = sorted(self._street_set)
+        self.neighborhoods = {}
+        for hood, point in data["neighborhoods"].items():
+            for alias in neighborhood_aliases(hood):
+                self.neighborhoods.setdefault(alias, (hood, point))
+
+    def match_street(self, name):
+        street = normalize_street(name)
+        if street in self._street_set:
+            return street
+        close = difflib.get_close_matches(street, self.streets, n=1, cutoff=FUZZY_CUTOFF)
+        return close[0] if close else None
+
+_tables_by_path = {}
+_tables_lock = threading.Lock()
+
+def _tables(path=GAZETTEER_FILE):
+    """Lookup tables for the persisted gazetteer (empty before the first build), read once per process."""
+    with _tables_lock:
+        if path not in _tables_by_path:
+            data = {"intersections": {}, "segments": {}, "neighborhoods": {}}
+            if os.path.exists(path):
+                with open(path) as f:
+                    data.update(json.load(f))
+            _tables_by_path[path] = _Gazetteer(data)
+        return _tables_by_path[path]
+
+def load_gazetteer(path=GAZETTEER_FILE):
+    return _tables(path).data
+
+
+# ✅ Offline Lookup
+def _result(name, point):
+    return {
+        "lat": point[0],
+        "lng": point[1],
+        "city": "San Francisco",
+        "state_code": "CA",
+        "formatted_address": f"{string.capwords(name)}, San Francisco, CA",
+    }
+
+def lookup(query, path=GAZETTEER_FILE):
+    """
+    Resolves an SF street segment, intersection or neighborhood name offline.
+
+    Only queries scoped to San Francisco ("..., San Francisco, CA" / "..., SF") or in the
+    dataset's own "X BETWEEN A AND B" form are answered; anything else, and any name the
+    gazetteer doesn't know, returns None so the caller falls back to the online geocoder.
+    """
+    tables = _tables(path)
+    if not tables.intersections:
+        return None
+
+    text = re.sub(r"\s+", " ", str(query).upper()).strip()
+    core = _SF_SUFFIX.sub("", text).strip(" ,")
+    segment = parse_route_location(core)
+    if core == text and segment is None:
+        return None  # Not scoped to SF
+
+    if segment is not None:
+        street, a, b = (tables.match_street(part) for part in segment)
+        if street and a and b:
+            for name in (f"{street} BETWEEN {a} AND {b}", f"{street} BETWEEN {b} AND {a}"):
+                if name in tables.segments:
+                    return _result(name, tables.segments[name])
+        return None
+
+    parts = _INTERSECTION.split(core)
+    if len(parts) == 2:
+        a, b = (tables.match_street(part) for part in parts)
+        key = intersection_key(a, b) if a and b else None
+        if key in tables.intersections:
+            return _result(key, tables.intersections[key])
+        return None
+
+    close = difflib.get_close_matches(core, tables.neighborhoods, n=1, cutoff=FUZZY_CUTOFF)
+    if close:
+        hood, point = tables.neighborhoods[close[0]]
+        if point is not None:
+            return _result(close[0], point)
+    return None
+
+def locate_routes(route_locations, path=GAZETTEER_FILE):
+    """
+    Coordinates for a column of `route_location` values, as a DataFrame with `lat`/`lng`
+    aligned to the input (NaN for unknown segments). Each distinct route is resolved once.
+    """
+    tables = _tables(path)
+    routes = pd.Series(route_locations)
+    unique = routes.dropna().unique()
+
+    points = {}
+    for route in unique:
+        segment = parse_route_location(route)
+        if segment is not None:
+            points[route] = tables.segments.get("{} BETWEEN {} AND {}".format(*segment))
+
+    coords = routes.map(points)
+    return pd.DataFrame({
+        "lat": coords.map(lambda point: point[0] if point else None).astype(float),
+        "lng": coords.map(lambda point: point[1] if point else None).astype(float),
+    }, index=routes.index)
+
+
+if __name__ == "__main__":
+    # python -m services.sf_gazetteer — (re)build from the cached street data
+    from services.datasf_analytics_services import get_cleaned_data
+
+    built = build_gazetteer(get_cleaned_data(columns=["route_location", "analysis_neighborhoods"]))
+    print(f"Gazetteer: {len(built['intersections'])} intersections, {len(built['segments'])} segments, "
+          f"{len(built['neighborhoods'])} neighborhoods -> {GAZETTEER_FILE}")
@@ -0,0 +1,176 @@
+import collections
+import threading
+import uuid
+import zlib
+
+import numpy as np
+import pandas as pd
+from services.geo_utils import distances_within, haversine_km
+
+KM_PER_DEGREE = 111.195  # Length of one degree of latitude
+DEFAULT_CELL_KM = 0.25
+
+
+class SpatialIndex:
+    """
+    Uniform lat/lng grid over a point dataset for radius and k-nearest queries.
+
+    Points are bucketed into cells of roughly `cell_km` and stored sorted by cell key,
+    so a query only scans the handful of cells that overlap its bounding box.
+    """
+
+    def __init__(self, df, lat_col="latitude", lng_col="longitude", cell_km=DEFAULT_CELL_KM):
+        df = df.dropna(subset=[lat_col, lng_col]).reset_index(drop=True)
+        self.df = df
+        self.lats = df[lat_col].to_numpy(dtype=float)
+        self.lngs = df[lng_col].to_numpy(dtype=float)
+
+        self._cell_lat = cell_km / KM_PER_DEGREE
+        ref_lat = float(np.mean(self.lats)) if len(self.lats) else 0.0
+        self._cell_lng = cell_km / (KM_PER_DEGREE * max(np.cos(np.radians(ref_lat)), 0.01))
+
+        rows = np.floor(self.lats / self._cell_lat).astype(np.int64)
+        cols = np.floor(self.lngs / self._cell_lng).astype(np.int64)
+        self._row_min = int(rows.min()) if len(rows) else 0
+        self._col_min = int(cols.min()) if len(cols) else 0
+        self._n_rows = int(rows.max()) - self._row_min + 1 if len(rows) else 0
+        self._n_cols = int(cols.max()) - self._col_min + 1 if len(cols) else 0
+
+        keys = (rows - self._row_min) * self._n_cols + (cols - self._col_min)
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
+
+    def __len__(self):
+        return len(self.lats)
+
+    def _candidates(self, lat, lng, radius_km):
+        """Positions of all points in grid cells overlapping the query's bounding box."""
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+
+        dlat = radius_km / KM_PER_DEGREE
+        max_abs_lat = min(abs(lat) + dlat, 89.0)
+        dlng = radius_km / (KM_PER_DEGREE * np.cos(np.radians(max_abs_lat)))
+
+        r0 = max(int(np.floor((lat - dlat) / self._cell_lat)) - self._row_min, 0)
+        r1 = min(int(np.floor((lat + dlat) / self._cell_lat)) - self._row_min, self._n_rows - 1)
+        c0 = max(int(np.floor((lng - dlng) / self._cell_lng)) - self._col_min, 0)
+        c1 = min(int(np.floor((lng + dlng) / self._cell_lng)) - self._col_min, self._n_cols - 1)
+        if r0 > r1 or c0 > c1:
+            return np.empty(0, dtype=np.int64)
+
+        # Each grid row contributes one contiguous key range [row*n_cols + c0, row*n_cols + c1]
+        row_offsets = np.arange(r0, r1 + 1, dtype=np.int64) * self._n_cols
+        starts = np.searchsorted(self._sorted_keys, row_offsets + c0, side="left")
+        ends = np.searchsorted(self._sorted_keys, row_offsets + c1, side="right")
+        slices = [self._order[s:e] for s, e in zip(starts, ends) if e > s]
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def _query_within(self, lat, lng, radius_km, refine=True):
+        candidates = self._candidates(lat, lng, radius_km)
+        mask, distances = distances_within(lat, lng, self.lats[candidates], self.lngs[candidates], radius_km, refine)
+        positions, distances = candidates[mask], distances[mask]
+        order = np.argsort(distances, kind="stable")
+        return positions[order], distances[order]
+
+    def _result(self, positions, distances):
+        result = self.df.iloc[positions].copy()
+        result["distance_km"] = distances
+        return result
+
+    def within(self, lat, lng, radius_km):
+        """All points within `radius_km`, sorted by distance (adds a `distance_km` column)."""
+        return self._result(*self._query_within(lat, lng, radius_km))
+
+    def nearest(self, lat, lng, k=5):
+        """The `k` closest points, sorted by distance (adds a `distance_km` column)."""
+        k = min(k, len(self))
+        radius_km = self._cell_lat * KM_PER_DEGREE
+
+        # Grow the search radius until it holds k points; anything closer is inside it
+        extent_km = self._n_rows * self._cell_lat * KM_PER_DEGREE + self._n_cols * self._cell_lng * KM_PER_DEGREE
+        while radius_km < extent_km:
+            positions, distances = self._query_within(lat, lng, radius_km, refine=False)
+            if len(positions) >= k:
+                return self._result(positions[:k], distances[:k])
+            radius_km *= 2
+
+        # Query point far outside the grid: fall back to a full scan
+        distances = haversine_km(lat, lng, self.lats, self.lngs)
+        positions = np.argsort(distances, kind="stable")[:k]
+        return self._result(positions, distances[positions])
+
+
+# ✅ Process-wide index cache, one index per dataset version
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+VERSION_ATTR = "dataset_version"
+
+def stamp_version(df):
+    """
+    Tags a freshly loaded frame with a new version, once per load. pandas carries `attrs`
+    through copies and row filters, so later queries find their index without rehashing.
+    """
+    df.attrs[VERSION_ATTR] = (uuid.uuid4().hex, len(df))
+    return df
+
+# id(index) -> (index, identity); holding the index keeps its id from being reused
+_subset_identities = collections.OrderedDict()
+SUBSET_IDENTITY_MEMO_SIZE = 8
+
+def _subset_identity(index):
+    """Which rows of the load a filtered frame holds, from its index labels; memoized per index object."""
+    with _indexes_lock:
+        memo = _subset_identities.get(id(index))
+        if memo is not None and memo[0] is index:
+            return memo[1]
+
+    values = index.to_numpy()
+    if values.dtype == object:
+        values = pd.util.hash_pandas_object(index, index=False).to_numpy()
+    identity = zlib.crc32(np.ascontiguousarray(values).view(np.uint8))
+
+    with _indexes_lock:
+        _subset_identities[id(index)] = (index, identity)
+        while len(_subset_identities) > SUBSET_IDENTITY_MEMO_SIZE:
+            _subset_identities.popitem(last=False)
+    return identity
+
+def _coordinate_fingerprint(df, lat_col, lng_col):
+    return (len(df), float(df[lat_col].sum()), float(df[lng_col].sum()))
+
+def dataset_version(df, lat_col="latitude", lng_col="longitude"):
+    """
+    Version of a point dataset for the index cache. Frames from a stamped load are keyed
+    on the stamp plus which of its rows they hold, so equal-sized subsets don't share an
+    index; anything else falls back to a fingerprint of its coordinates.
+    """
+    stamped = df.attrs.get(VERSION_ATTR)
+    if not isinstance(stamped, tuple):  # Unstamped, or restored from an older snapshot
+        return _coordinate_fingerprint(df, lat_col, lng_col)
+
+    stamp, stamped_rows = stamped
+    if isinstance(df.index, pd.RangeIndex):
+        if df.index.equals(pd.RangeIndex(stamped_rows)):
+            return (stamp,)  # The whole load (or a copy of it)
+        return _coordinate_fingerprint(df, lat_col, lng_col)  # Renumbered subset: labels no longer identify rows
+    return (stamp, len(df), _subset_identity(df.index))
+
+def get_spatial_index(name, df, lat_col="latitude", lng_col="longitude", version=None):
+    """Returns the cached index for this dataset version, building it on first use."""
+    version = version if version is not None else dataset_version(df, lat_col, lng_col)
+
+    with _indexes_lock:
+        cached = _indexes.get(name)
+        if cached and cached[0] == version:
+            return cached[1]
+
+    index = SpatialIndex(df, lat_col, lng_col)
+    with _indexes_lock:
+        _indexes[name] = (version, index)  # Replaces the previous version of this dataset
+    return index
+
+def get_records_index(name, records, lat_key="lat", lng_key="lon"):
+    """Index over a list of dicts (e.g. static location lists)."""
+    return get_spatial_index(name, pd.DataFrame(records), lat_key, lng_key)
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from config.settings import STREET_MAINTENANCE
+from services.clients import get_http_session
+
+SYNC_STATE_FILE = "street_sync_state.json"
+PAGE_SIZE = 50000  # Socrata's maximum $limit per request
+MAX_WORKERS = 4  # Concurrent offset windows
+SYNC_INTERVAL_SECONDS = 3600  # Minimum time between incremental syncs
+WATERMARK_COLUMN = "creationdate"
+KEY_COLUMNS = ("objectid", WATERMARK_COLUMN)  # One evaluation; a re-sent row replaces the cached one
+
+
+# ✅ Sync State (watermark + last sync time)
+def load_sync_state(path=SYNC_STATE_FILE):
+    """Returns the stored sync state, or an empty state before the first sync."""
+    if not os.path.exists(path):
+        return {"watermark": None, "last_sync": 0}
+
+    with open(path) as f:
+        return json.load(f)
+
+def save_sync_state(state, path=SYNC_STATE_FILE):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # Concurrent writers never share a temp file
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def sync_due(state, interval=SYNC_INTERVAL_SECONDS):
+    """True when the last successful sync is older than `interval` seconds."""
+    return time.time() - state.get("last_sync", 0) >= interval
+
+
+# ✅ Socrata Paging
+def _where_clause(watermark):
+    return f"{WATERMARK_COLUMN} > '{watermark}'" if watermark else None
+
+def row_count_params(where=None):
+    params = {"$select": "count(*) AS row_count"}
+    if where:
+        params["$where"] = where
+    return params
+
+def page_params(offset, limit=PAGE_SIZE, where=None):
+    """One offset window. `:id` ordering keeps pages stable across requests."""
+    params = {"$limit": limit, "$offset": offset, "$order": ":id"}
+    if where:
+        params["$where"] = where
+    return params
+
+def parse_row_count(data):
+    return int(data[0]["row_count"]) if data else 0
+
+def fetch_row_count(where=None):
+    """Asks Socrata how many rows match, so offset windows can be planned up front."""
+    response = get_http_session().get(STREET_MAINTENANCE, params=row_count_params(where), timeout=30)
+    response.raise_for_status()
+    return parse_row_count(response.json())
+
+def fetch_page(offset, limit=PAGE_SIZE, where=None):
+    response = get_http_session().get(STREET_MAINTENANCE, params=page_params(offset, limit, where), timeout=60)
+    response.raise_for_status()
+    return response.json()
+
+def fetch_rows(where=None, page_size=PAGE_SIZE, max_workers=MAX_WORKERS):
+    """Fetches every row matching `where`, with offset windows requested concurrently."""
+    total = fetch_row_count(where)
+    if total == 0:
+        return pd.DataFrame()
+
+    offsets = range(0, total, page_size)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pages = list(executor.map(lambda offset: fetch_page(offset, page_size, where), offsets))
+
+    rows = [row for page in pages for row in page]
+    return pd.DataFrame(rows)
+
+
+# ✅ Full & Incremental Sync
+def sync_street_data(state=None):
+    """
+    Pulls street maintenance rows from Socrata.
+
+    The first run pages through the whole dataset; later runs only fetch rows
+    whose `creationdate` is newer than the stored watermark.
+
+    Returns:
+        tuple: (DataFrame of new raw rows, updated sync state). The state is not
+        persisted here; callers save it once the rows are merged into the cache.
+    """
+    state = dict(state or load_sync_state())
+    new_rows = fetch_rows(_where_clause(state.get("watermark")))
+    return new_rows, advance_sync_state(state, new_rows)
+
+def advance_sync_state(state, new_rows):
+    """Moves the watermark past `new_rows` and stamps the sync time."""
+    state = dict(state)
+    if not new_rows.empty and WATERMARK_COLUMN in new_rows.columns:
+        newest = new_rows[WATERMARK_COLUMN].max()
+        if not state.get("watermark") or newest > state["watermark"]:
+            state["watermark"] = newest  # ISO-8601 text compares chronologically
+
+    state["last_sync"] = time.time()
+    return state
+
+def unseen_rows(cached_df, new_df, key_columns=KEY_COLUMNS):
+    """The rows of `new_df` whose keys aren't in the cache yet (what `merge_rows` adds rather than replaces)."""
+    keys = list(key_columns)
+    new_df = new_df.drop_duplicates(subset=keys, keep="last")
+    if cached_df.empty:
+        return new_df
+
+    seen = pd.MultiIndex.from_frame(cached_df[keys].astype(str))
+    return new_df[~pd.MultiIndex.from_frame(new_df[keys].astype(str)).isin(seen)]
+
+def merge_rows(cached_df, new_df, key_columns=KEY_COLUMNS):
+    """Appends newly synced rows to the cache, dropping rows that are already present."""
+    if cached_df.empty:
+        return new_df.reset_index(drop=True)
+    if new_df.empty:
+        return cached_df
+
+    merged = pd.concat([cached_df, new_df], ignore_index=True)
+    return merged.drop_duplicates(subset=list(key_columns), keep="last").reset_index(drop=True)
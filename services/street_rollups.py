@@ -0,0 +1,90 @@
+import pandas as pd
+
+DIMENSIONS = ["month", "analysis_neighborhoods", "route_type"]
+SUM_COLUMNS = [
+    "how_many_instances_of_graffiti", "how_many_instances_of_feces",
+    "how_many_large_abandoned", "how_many_abandoned_syringes",
+]
+CLEANLINESS_LEVELS = {
+    "Very Clean": "cleanliness_very_clean",
+    "Moderate Litter": "cleanliness_moderate_litter",
+    "Litter Accumulation": "cleanliness_litter_accumulation",
+    "Severely Dirty": "cleanliness_severely_dirty",
+}
+MEASURES = ["rows", "high_risk_rows", *SUM_COLUMNS, *CLEANLINESS_LEVELS.values()]
+
+
+def is_high_risk(df):
+    """Row-level high-risk rule shared by `get_high_risk_areas` and the rollups."""
+    return (df["how_many_instances_of_graffiti"] > 10) | (df["how_many_instances_of_feces"] > 5)
+
+def empty_rollup():
+    return pd.DataFrame(columns=DIMENSIONS + MEASURES)
+
+def build_rollup(df):
+    """
+    Aggregates preprocessed street rows into month × neighborhood × route type totals:
+    row counts, high-risk row counts, sums of the count columns and the number of rows
+    at each cleanliness level. The input frame is not modified.
+    """
+    if df.empty:
+        return empty_rollup()
+
+    counts = {col: pd.to_numeric(df[col], errors="coerce").fillna(0) for col in SUM_COLUMNS}
+    cleanliness = df["cleanliness_level"].astype("string")
+
+    parts = pd.DataFrame({
+        "month": pd.to_datetime(df["creationdate"]).dt.to_period("M").dt.to_timestamp(),
+        "analysis_neighborhoods": df["analysis_neighborhoods"].astype("string").fillna("Unknown"),
+        "route_type": df["route_type"].astype("string").fillna("Unknown"),
+        "rows": 1,
+        "high_risk_rows": is_high_risk(pd.DataFrame(counts)).astype(int),
+        **counts,
+        **{column: (cleanliness == level).fillna(False).astype(int) for level, column in CLEANLINESS_LEVELS.items()},
+    })
+    return parts.groupby(DIMENSIONS, sort=True).sum().reset_index()
+
+def combine(*rollups):
+    """Adds rollups together, e.g. the stored rollup and the rollup of newly synced rows."""
+    rollups = [rollup for rollup in rollups if not rollup.empty]
+    if not rollups:
+        return empty_rollup()
+    return pd.concat(rollups, ignore_index=True).groupby(DIMENSIONS, sort=True)[MEASURES].sum().reset_index()
+
+def total_rows(rollup):
+    return int(rollup["rows"].sum()) if not rollup.empty else 0
+
+
+# ✅ Queries
+def _filter(rollup, neighborhood=None, route_type=None):
+    if neighborhood is not None:
+        rollup = rollup[rollup["analysis_neighborhoods"] == neighborhood]
+    if route_type is not None:
+        rollup = rollup[rollup["route_type"] == route_type]
+    return rollup
+
+def monthly(rollup, columns, neighborhood=None, route_type=None):
+    """Monthly totals of `columns`, indexed by "YYYY-MM" strings for plotting."""
+    totals = _filter(rollup, neighborhood, route_type).groupby("month")[columns].sum()
+    totals.index = totals.index.strftime("%Y-%m")
+    totals.index.name = "month"
+    return totals
+
+def high_risk_summary(rollup, by="analysis_neighborhoods", start=None, end=None):
+    """High-risk row counts and share per `by` value, optionally within [start, end] months."""
+    if start is not None:
+        rollup = rollup[rollup["month"] >= pd.Timestamp(start)]
+    if end is not None:
+        rollup = rollup[rollup["month"] <= pd.Timestamp(end)]
+
+    summary = rollup.groupby(by)[["rows", "high_risk_rows"]].sum()
+    summary["high_risk_share"] = summary["high_risk_rows"] / summary["rows"]
+    return summary.sort_values("high_risk_rows", ascending=False).reset_index()
+
+def cleanliness_distribution(rollup, by="analysis_neighborhoods"):
+    """Share of evaluated routes at each cleanliness level per `by` value."""
+    levels = list(CLEANLINESS_LEVELS.values())
+    totals = rollup.groupby(by)[levels].sum()
+    shares = totals.div(totals.sum(axis=1).replace(0, 1), axis=0)
+    shares.columns = list(CLEANLINESS_LEVELS)
+    return shares
@@ -1,77 +1,24 @@
-import openai
-import requests
 import io
-import base64
-import os
+import hashlib
 from PIL import Image
-from config.settings import OPENAI_API_KEY, IWASTE_API_URL
-from google.cloud import vision
+from config.settings import IWASTE_API_URL, CLASSIFICATION_CACHE_TTL, CLASSIFICATION_CACHE_MAX_ENTRIES, LEXICON_CONFIDENCE_THRESHOLD, BATCH_MAX_WORKERS, IMAGE_CACHE_TTL, IMAGE_CACHE_MAX_ENTRIES, IMAGE_PHASH_MAX_DISTANCE
 import json
-import streamlit as st
-import base64
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from services.result_cache import ResultCache
+from services.clients import get_http_session, get_openai_client, get_vision_client
+import services.waste_lexicon as lexicon
+from services.waste_lexicon import normalize_item
 
-# ✅ Set OpenAI API Key
-openai.api_key = OPENAI_API_KEY
+# ✅ Google Cloud credentials are configured by settings.configure_google_credentials(),
+#    which the client registry runs before creating the Vision client.
 
-# ✅ Set Google Cloud Credentials
-# os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = os.path.abspath("gcloud_key.json")
 
-
-
-
-import os
-import json
-import streamlit as st
-import base64
-
-# ✅ FORCE DETECTION OF STREAMLIT CLOUD
-import os
-import json
-import streamlit as st
-import base64
-
-# ✅ Force detect if running in Streamlit Cloud
-#RUNNING_IN_STREAMLIT = "STREAMLIT_SERVER_RUN_ONCE" in os.environ or "STREAMLIT_CLOUD" in os.environ
-RUNNING_IN_STREAMLIT = True 
-if RUNNING_IN_STREAMLIT:
-    print("🚀 Running in Streamlit Cloud Mode!")
-    
-    if "google_cloud" in st.secrets and "GOOGLE_CLOUD_KEY" in st.secrets["google_cloud"]:
-        google_cloud_json_str = st.secrets["google_cloud"]["GOOGLE_CLOUD_KEY"]
-        google_cloud_json = json.loads(base64.b64decode(google_cloud_json_str))
-
-        # ✅ Write to a temporary JSON file
-        temp_gcloud_path = "/tmp/gcloud_key.json"
-        with open(temp_gcloud_path, "w") as f:
-            json.dump(google_cloud_json, f)
-
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = temp_gcloud_path
-        print(f"✅ Google Cloud credentials successfully written to {temp_gcloud_path}")
-
-    else:
-        raise FileNotFoundError("❌ Google Cloud key not found in Streamlit Secrets!")
-
-else:
-    print("💻 Running in Local Mode - Loading from .env file")
-    
-    # ✅ Load from .env for local development
-    from dotenv import load_dotenv
-    load_dotenv()
-    
-    GOOGLE_CLOUD_CREDENTIALS_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-
-    if GOOGLE_CLOUD_CREDENTIALS_PATH and os.path.exists(GOOGLE_CLOUD_CREDENTIALS_PATH):
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = GOOGLE_CLOUD_CREDENTIALS_PATH
-        print(f"✅ Running Locally - Using: {GOOGLE_CLOUD_CREDENTIALS_PATH}")
-    else:
-        raise FileNotFoundError("❌ Google Cloud credentials not found! Check .env file.")
-
-
-# ✅ Fetch Waste Categories from I-WASTE API
+# ✅ Fetch Waste Categories from I-WASTE API (on first use, not at import)
+@lru_cache(maxsize=1)
 def get_waste_categories():
     try:
-        response = requests.get(f"{IWASTE_API_URL}/categories")
+        response = get_http_session().get(f"{IWASTE_API_URL}/categories")
         if response.status_code == 200:
             return response.json()
         else:
@@ -79,8 +26,6 @@ def get_waste_categories():
     except Exception as e:
         return []
 
-WASTE_CATEGORIES = get_waste_categories()
-
 # ✅ Define Recology Bin Mapping
 BIN_MAPPING = {
     "Recyclable": {"bin": "♻️ Blue Bin (Recycling)", "image": "assets/recology.bluebin.svg"},
@@ -89,6 +34,13 @@ BIN_MAPPING = {
     "Hazardous": {"bin": "⚠️ Hazardous Waste Bin", "image": "assets/recology.hazardousbin.svg"}
 }
 
+# ✅ Persistent Classification Cache (keyed on normalized item text)
+classification_cache = ResultCache(
+    "classifications",
+    ttl_seconds=CLASSIFICATION_CACHE_TTL,
+    max_entries=CLASSIFICATION_CACHE_MAX_ENTRIES,
+)
+
 # def classify_waste(waste_item):
 #     """Uses OpenAI API to classify waste and suggest the correct bin."""
 #     try:
@@ -139,106 +91,269 @@ BIN_MAPPING = {
 #     except Exception as e:
 #         return {"error": f"OpenAI API Error: {str(e)}"}
 
-def analyze_image(image_file):
-    """Classifies an image into a waste category and suggests the correct bin."""
+# ✅ Image Analysis Cache (content hash, plus perceptual hash for re-encoded copies)
+image_cache = ResultCache(
+    "image_analyses",
+    ttl_seconds=IMAGE_CACHE_TTL,
+    max_entries=IMAGE_CACHE_MAX_ENTRIES,
+)
+
+def read_image_bytes(image_file):
+    if isinstance(image_file, io.BytesIO):  
+        return image_file.getvalue()
+    elif isinstance(image_file, str):  
+        with open(image_file, "rb") as img:
+            return img.read()
+    raise ValueError("Invalid image input")
+
+def perceptual_hash(content):
+    """64-bit difference hash (dHash): survives re-encoding, resizing and small edits."""
+    pixels = list(Image.open(io.BytesIO(content)).convert("L").resize((9, 8)).getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+def detect_labels(content):
+    """Runs Google Vision label detection and returns the lower-cased labels."""
+    from google.cloud import vision
+
+    client = get_vision_client()
+    image = vision.Image(content=content)
+    response = client.label_detection(image=image)
+    return [label.description.lower() for label in response.label_annotations]
+
+def _lookup_image(content_hash, phash):
+    cached = image_cache.get(content_hash)
+    if cached is None and phash is not None:
+        cached = image_cache.find_similar(phash, IMAGE_PHASH_MAX_DISTANCE)
+    return cached
+
+def analyze_image_stream(image_file):
+    """Like `analyze_image`, but the explanation is returned as a token stream."""
     try:
-        client = vision.ImageAnnotatorClient()
-        
-        if isinstance(image_file, io.BytesIO):  
-            content = image_file.getvalue()
-        elif isinstance(image_file, str):  
-            with open(image_file, "rb") as img:
-                content = img.read()
-        else:
-            return {"error": "Invalid image input"}
+        content = read_image_bytes(image_file)
+    except ValueError as e:
+        return {"error": str(e)}
+    except OSError as e:
+        return {"error": f"Google Vision API Error: {str(e)}"}
 
-        image = vision.Image(content=content)
-        response = client.label_detection(image=image)
-        labels = response.label_annotations
+    content_hash = hashlib.sha256(content).hexdigest()
+    try:
+        phash = perceptual_hash(content)
+    except Exception:
+        phash = None  # Not decodable by PIL; exact-match caching still applies
 
-        detected_labels = [label.description.lower() for label in labels]
-        classification_result = classify_waste(", ".join(detected_labels))
-
-        return {
-            "category": classification_result["category"],
-            "bin": classification_result["bin"],
-            "image": classification_result["image"],
-            "labels": detected_labels,
-            "explanation": classification_result["explanation"]
-        }
+    # ✅ Cache hits skip both Google Vision and OpenAI
+    cached = _lookup_image(content_hash, phash)
+    if cached:
+        return {**cached, "explanation_stream": iter([cached["explanation"]])}
 
+    try:
+        detected_labels = detect_labels(content)
     except Exception as e:
         return {"error": f"Google Vision API Error: {str(e)}"}
 
-def classify_waste(waste_item):
-    """Uses OpenAI API to classify waste and suggest the correct bin."""
-    try:
-        # ✅ Force strict classification
-        prompt = f"""
-        You are an expert in waste classification and disposal based on Recology guidelines.
-        You MUST classify the following waste item into ONE of these categories:
-        
-        1️⃣ **Recyclable** (Blue Bin): Paper (non-waxed), cardboard, glass bottles & jars, metal cans, plastic bottles & tubs.
-        2️⃣ **Compostable** (Green Bin): Food scraps, soiled paper (pizza boxes, napkins), plants, tree trimmings.
-        3️⃣ **Landfill** (Black Bin): Non-recyclable plastics, diapers, pet waste, ceramics, foam, plastic bags, pads, menstrual items.
-        4️⃣ **Hazardous** (Special Disposal): Batteries, electronics, chemicals, fluorescent bulbs, treated wood.
+    result = classify_waste_stream(", ".join(detected_labels))
+    if "error" in result:
+        return result
+    result["labels"] = detected_labels
 
-        📌 **IMPORTANT RULES:**
-        - If the item is **food-related and biodegradable**, classify it as **Compostable**.
-        - If the item consists of **clean, recyclable material** (paper, glass, plastic, metal), classify it as **Recyclable**.
-        - If the item is **a mix of materials, contaminated, or non-recyclable plastic**, classify it as **Landfill**.
-        - If the item is **toxic, electronic, or contains hazardous chemicals**, classify it as **Hazardous**.
+    def explanation_stream(tokens):
+        parts = []
+        for token in tokens:
+            parts.append(token)
+            yield token
 
-        ⚠️ **Do NOT make up categories. Only use: Recyclable, Compostable, Landfill, or Hazardous.** 
+        explanation = "".join(parts).strip()
+        if explanation and "⚠️ Error generating explanation" not in explanation:
+            entry = {key: value for key, value in result.items() if key != "explanation_stream"}
+            image_cache.put(content_hash, {**entry, "explanation": explanation}, fingerprint=phash)
 
-        Waste Item: **{waste_item}**
+    result["explanation_stream"] = explanation_stream(result["explanation_stream"])
+    return result
 
-        Respond ONLY with the category name (one of: Recyclable, Compostable, Landfill, Hazardous).
-        """
+def analyze_image(image_file):
+    """Classifies an image into a waste category and suggests the correct bin."""
+    result = analyze_image_stream(image_file)
+    if "error" in result:
+        return result
 
-        client = openai.OpenAI()
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}]
-        )
+    return _collect_explanation(result)
 
-        classification_result = response.choices[0].message.content.strip()
+# ✅ One request: a JSON category header line, then the explanation text
+CLASSIFICATION_PROMPT = """
+You are an expert in waste classification and disposal based on Recology guidelines.
+You MUST classify the following waste item into ONE of these categories:
 
-        # ✅ Force classification into one of our predefined categories
-        category = "Landfill"  # Default fallback
-        for key in BIN_MAPPING.keys():
-            if key.lower() in classification_result.lower():
-                category = key
-                break
+1️⃣ **Recyclable** (Blue Bin): Paper (non-waxed), cardboard, glass bottles & jars, metal cans, plastic bottles & tubs.
+2️⃣ **Compostable** (Green Bin): Food scraps, soiled paper (pizza boxes, napkins), plants, tree trimmings.
+3️⃣ **Landfill** (Black Bin): Non-recyclable plastics, diapers, pet waste, ceramics, foam, plastic bags, pads, menstrual items.
+4️⃣ **Hazardous** (Special Disposal): Batteries, electronics, chemicals, fluorescent bulbs, treated wood.
 
-        # ✅ Hardcoded Corrections for Common Items (Prevents OpenAI Errors)
-        landfill_items = ["diaper", "pads", "menstrual", "sanitary", "napkin", "ceramic", "foam", "plastic bags"]
-        compostable_items = ["food scraps", "banana peel", "vegetable", "fruit", "plant"]
-        hazardous_items = ["battery", "electronics", "fluorescent", "chemical", "treated wood"]
+📌 **IMPORTANT RULES:**
+- If the item is **food-related and biodegradable**, classify it as **Compostable**.
+- If the item consists of **clean, recyclable material** (paper, glass, plastic, metal), classify it as **Recyclable**.
+- If the item is **a mix of materials, contaminated, or non-recyclable plastic**, classify it as **Landfill**.
+- If the item is **toxic, electronic, or contains hazardous chemicals**, classify it as **Hazardous**.
 
-        lower_waste_item = waste_item.lower()
+⚠️ **Do NOT make up categories. Only use: Recyclable, Compostable, Landfill, or Hazardous.** 
 
-        if any(item in lower_waste_item for item in landfill_items):
-            category = "Landfill"
-        elif any(item in lower_waste_item for item in compostable_items):
-            category = "Compostable"
-        elif any(item in lower_waste_item for item in hazardous_items):
-            category = "Hazardous"
+Waste Item: **{waste_item}**
 
-        # ✅ Get Bin Information
-        bin_info = BIN_MAPPING[category]
-        explanation = get_waste_explanation(waste_item, category)
+### Response Format:
+Line 1: ONLY a JSON object, e.g. {{"category": "Recyclable"}}
+Then, starting on line 2, an explanation that:
+- Explains what this waste material is.
+- Suggests proper disposal methods.
+- Explains why it belongs to that category.
+- Motivates the user by explaining how proper disposal helps sustainability.
 
+Keep the explanation clear and informative.
+"""
+
+def _resolve_category(model_answer, waste_item):
+    """Maps the model's answer onto our categories, then applies hardcoded corrections."""
+    try:
+        answer = str(json.loads(model_answer).get("category", ""))
+    except (ValueError, AttributeError):
+        answer = model_answer  # Not valid JSON; fall back to a substring match
+
+    # ✅ Force classification into one of our predefined categories
+    category = "Landfill"  # Default fallback
+    for key in BIN_MAPPING.keys():
+        if key.lower() in answer.lower():
+            category = key
+            break
+
+    # ✅ Lexicon Corrections for Common Items (Prevents OpenAI Errors)
+    return lexicon.override_category(waste_item) or category
+
+def _split_header(tokens):
+    """Consumes streamed tokens up to the end of the first line; returns (header, remainder)."""
+    buffer = ""
+    for token in tokens:
+        buffer += token
+        if "\n" in buffer:
+            header, remainder = buffer.split("\n", 1)
+            return header.strip(), remainder
+    return buffer.strip(), ""
+
+def classify_waste_stream(waste_item):
+    """
+    Classifies a waste item with a single streamed OpenAI request.
+
+    Returns as soon as the category line has arrived. The result holds the category,
+    bin and image, plus "explanation_stream", an iterator over the explanation text.
+    The complete answer is cached once the stream has been consumed.
+    """
+    # ✅ Local fast path: common items resolve from the lexicon without calling OpenAI
+    local_category, confidence = lexicon.classify_locally(waste_item)
+    if local_category and confidence >= LEXICON_CONFIDENCE_THRESHOLD:
+        bin_info = BIN_MAPPING[local_category]
+        explanation = lexicon.local_explanation(waste_item, local_category)
         return {
-            "category": category,
+            "category": local_category,
             "bin": bin_info["bin"],
             "image": bin_info["image"],
-            "explanation": explanation
+            "explanation_stream": iter([explanation]),
         }
 
+    cache_key = normalize_item(waste_item)
+    cached = classification_cache.get(cache_key)
+    if cached:
+        return {**cached, "explanation_stream": iter([cached["explanation"]])}
+
+    try:
+        client = get_openai_client()
+        stream = client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": CLASSIFICATION_PROMPT.format(waste_item=waste_item)}],
+            stream=True
+        )
+        tokens = (chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+        header, remainder = _split_header(tokens)
     except Exception as e:
         return {"error": f"OpenAI API Error: {str(e)}"}
 
+    # ✅ Get Bin Information
+    category = _resolve_category(header, waste_item)
+    bin_info = BIN_MAPPING[category]
+    result = {
+        "category": category,
+        "bin": bin_info["bin"],
+        "image": bin_info["image"],
+    }
+
+    def explanation_stream():
+        parts = [remainder.lstrip()]
+        yield parts[0]
+        try:
+            for token in tokens:
+                parts.append(token)
+                yield token
+        except Exception as e:
+            yield f"\n\n⚠️ Error generating explanation: {str(e)}"
+            return
+
+        # ✅ Only cache complete answers
+        explanation = "".join(parts).strip()
+        if explanation:
+            entry = {key: value for key, value in result.items() if key != "explanation_stream"}
+            classification_cache.put(cache_key, {**entry, "explanation": explanation})
+
+    result["explanation_stream"] = explanation_stream()
+    return result
+
+def _collect_explanation(result):
+    """Drains the explanation stream into a plain `explanation` string."""
+    stream = result.pop("explanation_stream")
+    explanation = "".join(stream).strip()
+    result["explanation"] = explanation or "⚠️ No explanation available. Please try again."
+    return result
+
+def classify_waste(waste_item):
+    """Uses OpenAI API to classify waste and suggest the correct bin."""
+    result = classify_waste_stream(waste_item)
+    if "error" in result:
+        return result
+
+    return _collect_explanation(result)
+
+def classify_many(items, max_workers=BATCH_MAX_WORKERS, on_result=None):
+    """
+    Classifies many items, running each unique (normalized) item once.
+
+    Parameters:
+        items (list[str]): Waste items; duplicates are classified only once.
+        max_workers (int): Maximum number of concurrent classifications.
+        on_result (callable): Optional `on_result(key, result)` hook, called as each
+            unique item finishes so callers can write results incrementally.
+
+    Returns:
+        list[dict]: One result per input item, in input order.
+    """
+    keys = [normalize_item(item) for item in items]
+    unique_items = {}
+    for item, key in zip(items, keys):
+        unique_items.setdefault(key, item)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(classify_waste, item): key for key, item in unique_items.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                results[key] = {"error": f"Classification Error: {str(e)}"}
+
+            if on_result:
+                on_result(key, results[key])
+
+    return [results[key] for key in keys]
+
 def get_waste_explanation(waste_item, category):
     """Uses OpenAI API to generate an explanation of the waste material."""
     prompt = f"""
@@ -258,7 +373,7 @@ def get_waste_explanation(waste_item, category):
     """
     
     try:
-        client = openai.OpenAI()
+        client = get_openai_client()
         response = client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": prompt}]
@@ -0,0 +1,155 @@
+import csv
+import re
+from collections import deque
+from functools import lru_cache
+
+LEXICON_FILE = "data/recology_lexicon.csv"
+
+# Precedence when several "override" terms match, as in the original hardcoded corrections
+OVERRIDE_PRIORITY = ["Landfill", "Compostable", "Hazardous", "Recyclable"]
+
+# Words that describe an item's state rather than what it is; they don't count against coverage
+IGNORED_WORDS = {"a", "an", "the", "of", "my", "some", "old", "empty", "small", "large", "big", "clean", "with", "and", "for", "in", "on"}
+
+# Contamination can move an item to Landfill; unless a lexicon term covers the word ("used paper
+# towel"), items like "dirty glass jar" are left to the LLM
+CONTAMINATION_WORDS = {"dirty", "used", "soiled", "greasy", "contaminated", "stained", "moldy", "wet", "oily"}
+CONTAMINATED_CONFIDENCE = 0.5
+
+LOCAL_EXPLANATIONS = {
+    "Recyclable": "**{item}** is made of clean paper, glass, metal or rigid plastic that Recology can sort and turn into new products. Empty and rinse it, then place it loose in the Blue Bin. Recycling keeps these materials in use and saves the energy needed to make them from scratch.",
+    "Compostable": "**{item}** is organic material that breaks down naturally. Place it in the Green Bin, where Recology turns it into compost for local farms. Composting keeps food and plant waste out of landfill, where it would release methane.",
+    "Landfill": "**{item}** can't be recycled or composted in San Francisco, usually because it is mixed-material, soiled, soft plastic or foam. Place it in the Black Bin. Choosing reusable alternatives helps reduce what ends up in landfill.",
+    "Hazardous": "**{item}** contains batteries, electronics or chemicals that can cause fires or leak toxins. Never put it in any curbside bin; take it to a household hazardous waste or e-waste drop-off. Safe disposal protects workers, wildlife and water.",
+}
+
+
+def _singular(word):
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("ches", "shes", "xes", "sses")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us")):
+        return word[:-1]
+    return word
+
+def normalize_item(waste_item):
+    """Normalizes item text so "Plastic Bottle!" and " plastic  bottle" share a cache entry."""
+    text = re.sub(r"[^\w\s,]", " ", waste_item.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+def _match_form(text):
+    """Form used for matching: normalized, punctuation-free, singular words."""
+    words = re.sub(r"[^\w\s]", " ", normalize_item(text)).split()
+    return " ".join(_singular(word) for word in words)
+
+
+class AhoCorasick:
+    """Compiled multi-pattern matcher: finds every pattern occurrence in one pass over the text."""
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for pattern_id, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            self._output[node].append(pattern_id)
+
+        # Breadth-first pass to build failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def search(self, text):
+        """Yields (end_index, pattern_id) for every match, including overlapping ones."""
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for pattern_id in self._output[node]:
+                yield i, pattern_id
+
+
+@lru_cache(maxsize=1)
+def load_lexicon(path=LEXICON_FILE):
+    """Returns (terms, matcher); terms are (match form, category, weight, override) tuples."""
+    with open(path, newline="") as f:
+        terms = [
+            (_match_form(row["term"]), row["category"], float(row["weight"]), row["override"] == "1")
+            for row in csv.DictReader(f)
+        ]
+
+    # Pad with spaces so matches only land on whole words
+    matcher = AhoCorasick([f" {term} " for term, _, _, _ in terms])
+    return terms, matcher
+
+def find_terms(waste_item):
+    """Lexicon terms found in the item, longest first, without overlapping each other."""
+    terms, matcher = load_lexicon()
+    text = f" {_match_form(waste_item)} "
+
+    matches = []
+    for end, term_id in matcher.search(text):
+        length = len(terms[term_id][0])
+        matches.append((end - length, end, term_id))  # [start, end) of the term itself
+
+    chosen, covered = [], set()
+    for start, end, term_id in sorted(matches, key=lambda m: m[1] - m[0], reverse=True):
+        span = set(range(start, end))
+        if not span & covered:
+            chosen.append(terms[term_id])
+            covered |= span
+    return chosen
+
+def classify_locally(waste_item):
+    """
+    Classifies an item from the lexicon alone.
+
+    Returns:
+        tuple: (category or None, confidence between 0 and 1). Confidence is the
+        weighted share of the item's words covered by the winning category's terms.
+    """
+    found = find_terms(waste_item)
+    if not found:
+        return None, 0.0
+
+    scores = {}
+    for term, category, weight, _ in found:
+        scores[category] = scores.get(category, 0.0) + weight * len(term.replace(" ", ""))
+
+    category = max(scores, key=scores.get)
+    words = [w for w in _match_form(waste_item).split() if w not in IGNORED_WORDS]
+    total_chars = sum(len(w) for w in words) or 1
+    confidence = min(scores[category] / total_chars, 1.0)
+
+    covered_words = {word for term, _, _, _ in found for word in term.split()}
+    if any(w in CONTAMINATION_WORDS and w not in covered_words for w in words):
+        confidence = min(confidence, CONTAMINATED_CONFIDENCE)
+    return category, confidence
+
+def override_category(waste_item):
+    """Category forced by an "override" term (known model mistakes), if any."""
+    categories = {category for _, category, _, override in find_terms(waste_item) if override}
+    for category in OVERRIDE_PRIORITY:
+        if category in categories:
+            return category
+    return None
+
+def local_explanation(waste_item, category):
+    return LOCAL_EXPLANATIONS[category].format(item=waste_item.strip())
@@ -1,9 +1,21 @@
-import requests
-import streamlit as st
-from config.settings import OPENWEATHER_API_KEY, OPENWEATHER_API_URL  # Fetch API key and URL dynamically
+import config.settings as settings
+from config.settings import OPENWEATHER_API_URL, WEATHER_REFRESH_INTERVAL  # API key is read lazily via settings
+from services.clients import get_http_session
+from services.refresh_scheduler import scheduler
+
+def _load_weather(city):
+    params = {
+        "q": city,
+        "appid": settings.OPENWEATHER_API_KEY,
+        "units": "metric"  # Convert temperature to Celsius for readability
+    }
+    response = get_http_session().get(OPENWEATHER_API_URL, params=params, timeout=30)
+    response.raise_for_status()  # Raise an error for bad HTTP responses (4xx, 5xx)
+    return response.json()
+
+# ✅ Each city's report is refreshed in the background every 30 minutes while people ask for it
+scheduler.register("weather", _load_weather, interval=WEATHER_REFRESH_INTERVAL)
 
-# ✅ Cache API response for 30 minutes to reduce redundant API calls
-@st.cache_data(ttl=1800)
 def get_weather(city):
     """
     Fetches real-time weather data for a given city from OpenWeather API.
@@ -17,19 +29,11 @@ def get_weather(city):
     if not city:
         return {"error": "⚠️ Please provide a valid city name."}
 
-    params = {
-        "q": city,
-        "appid": OPENWEATHER_API_KEY,
-        "units": "metric"  # Convert temperature to Celsius for readability
-    }
-
-    try:
-        response = requests.get(OPENWEATHER_API_URL, params=params)
-        response.raise_for_status()  # Raise an error for bad HTTP responses (4xx, 5xx)
-        return response.json()
-
-    except requests.exceptions.RequestException as e:
-        return {"error": f"⚠️ API Error: {e}"}
+    key = city.strip().lower()
+    data = scheduler.get("weather", key)
+    if data is None:
+        return {"error": f"⚠️ API Error: {scheduler.last_error('weather', key)}"}
+    return data
 
 def format_weather_data(data):
     """
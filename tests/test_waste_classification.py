@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+
+import services.waste_classification as waste_classification
+from services.result_cache import ResultCache
+
+# Not in the lexicon, so it always goes to OpenAI
+ITEM = "Yoga Mat"
+ANSWER = ['{"category": "Landfill"}\n', "Foam mats can't be ", "recycled in San Francisco."]
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+class FakeOpenAI:
+    """Streams ANSWER one token per chunk and counts requests."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        return iter([_chunk(token) for token in ANSWER])
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    cache = ResultCache("classifications", ttl_seconds=3600, max_entries=100, path=str(tmp_path / "results.sqlite3"))
+    monkeypatch.setattr(waste_classification, "classification_cache", cache)
+
+    fake = FakeOpenAI()
+    monkeypatch.setattr(waste_classification, "get_openai_client", lambda: fake)
+    return fake
+
+def test_drained_stream_fills_the_result_cache(client):
+    result = waste_classification.classify_waste_stream(ITEM)
+    explanation = "".join(result["explanation_stream"])
+
+    assert result["category"] == "Landfill"
+    assert explanation.strip() == "Foam mats can't be recycled in San Francisco."
+    cached = waste_classification.classification_cache.get("yoga mat")
+    assert cached["category"] == "Landfill"
+    assert "explanation_stream" not in cached
+
+    # Same item again: served from the cache without another OpenAI request
+    again = waste_classification.classify_waste_stream("  yoga   MAT ")
+    assert "".join(again["explanation_stream"]) == cached["explanation"]
+    assert client.calls == 1
+
+def test_undrained_stream_is_not_cached(client):
+    waste_classification.classify_waste_stream(ITEM)
+
+    assert waste_classification.classification_cache.get("yoga mat") is None
+
+def test_openai_requests_scale_with_unique_items(client):
+    # What the UI does per submission: stream the answer and drain it with st.write_stream
+    submissions = ["Yoga Mat", "Old Sneakers", "yoga mat", "Old sneakers!", "Broken Umbrella", "YOGA MAT"]
+    for item in submissions:
+        result = waste_classification.classify_waste_stream(item)
+        "".join(result["explanation_stream"])
+
+    assert client.calls == 3
+
+    # The non-streaming path shares the same entries
+    assert waste_classification.classify_waste("broken umbrella")["category"] == "Landfill"
+    assert client.calls == 3